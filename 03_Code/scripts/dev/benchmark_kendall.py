@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Time the Kendall correlation matrix on a random wide table.
+"""
+import sys
+import time
+import argparse
+from pathlib import Path
+
+import numpy as np
+import matplotlib
+
+matplotlib.use("Agg")
+
+sys.path.append(str(Path(__file__).resolve().parents[2] / "src"))
+
+from nonparametric_analysis.core.correlation import _rank_corr_block
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark the Kendall matrix.")
+    parser.add_argument("--rows", type=int, default=100_000, help="Rows per column")
+    parser.add_argument("--cols", type=int, default=200, help="Number of columns")
+    parser.add_argument("--n-jobs", type=int, default=1, help="Worker processes")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    rng = np.random.default_rng(args.seed)
+    values = rng.normal(size=(args.rows, args.cols))
+
+    start = time.perf_counter()
+    _rank_corr_block(values, "kendall", n_jobs=args.n_jobs)
+    elapsed = time.perf_counter() - start
+
+    n_pairs = args.cols * (args.cols - 1) // 2
+    print(
+        f"{args.rows} rows x {args.cols} cols, n_jobs={args.n_jobs}: "
+        f"{elapsed:.2f} s ({1000 * elapsed / max(n_pairs, 1):.2f} ms per pair)"
+    )
+
+
+if __name__ == "__main__":
+    main()
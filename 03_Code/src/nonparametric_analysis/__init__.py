@@ -6,9 +6,16 @@ __version__ = "0.1.0"
 from .core import (
     # single_variable
     test_normality,
+    normality_batch,
     runs_test_analysis,
+    runs_test_batch,
     mann_kendall_test,
+    mann_kendall_batch,
+    mann_kendall_panel,
+    sens_slope,
     pettitt_test,
+    pettitt_batch,
+    pettitt_segmentation,
     detect_changepoints_pelt,
     # group_comparison
     mann_whitney_test,
@@ -21,10 +28,17 @@ from .core import (
     # correlation
     spearman_correlation,
     correlation_matrix_nonparametric,
+    correlation_matrix_blocked,
+    top_correlated_pairs,
+    append_spearman,
+    save_spearman_state,
+    load_spearman_state,
     kendall_corr,
     distance_correlation,
     # resampling
     bootstrap_ci,
+    bootstrap_ci_streaming,
+    bootstrap_blb,
     permutation_test,
 )
 
@@ -53,9 +67,16 @@ from .visualization import setup_visualization
 __all__ = [
     # Core analysis
     "test_normality",
+    "normality_batch",
     "runs_test_analysis",
+    "runs_test_batch",
     "mann_kendall_test",
+    "mann_kendall_batch",
+    "mann_kendall_panel",
+    "sens_slope",
     "pettitt_test",
+    "pettitt_batch",
+    "pettitt_segmentation",
     "detect_changepoints_pelt",
     "mann_whitney_test",
     "ks_test",
@@ -66,9 +87,16 @@ __all__ = [
     "friedman_test",
     "spearman_correlation",
     "correlation_matrix_nonparametric",
+    "correlation_matrix_blocked",
+    "top_correlated_pairs",
+    "append_spearman",
+    "save_spearman_state",
+    "load_spearman_state",
     "kendall_corr",
     "distance_correlation",
     "bootstrap_ci",
+    "bootstrap_ci_streaming",
+    "bootstrap_blb",
     "permutation_test",
     # Utilities
     "interpret_p_value",
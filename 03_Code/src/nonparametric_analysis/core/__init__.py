@@ -2,9 +2,16 @@
 
 from .single_variable import (
     test_normality,
+    normality_batch,
     runs_test_analysis,
+    runs_test_batch,
     mann_kendall_test,
+    mann_kendall_batch,
+    mann_kendall_panel,
+    sens_slope,
     pettitt_test,
+    pettitt_batch,
+    pettitt_segmentation,
     detect_changepoints_pelt,
 )
 from .group_comparison import (
@@ -19,20 +26,34 @@ from .group_comparison import (
 from .correlation import (
     spearman_correlation,
     correlation_matrix_nonparametric,
+    correlation_matrix_blocked,
+    top_correlated_pairs,
+    append_spearman,
+    save_spearman_state,
+    load_spearman_state,
     kendall_corr,
     distance_correlation,
 )
 from .resampling import (
     bootstrap_ci,
+    bootstrap_ci_streaming,
+    bootstrap_blb,
     permutation_test,
 )
 
 __all__ = [
     # single_variable
     "test_normality",
+    "normality_batch",
     "runs_test_analysis",
+    "runs_test_batch",
     "mann_kendall_test",
+    "mann_kendall_batch",
+    "mann_kendall_panel",
+    "sens_slope",
     "pettitt_test",
+    "pettitt_batch",
+    "pettitt_segmentation",
     "detect_changepoints_pelt",
     # group_comparison
     "mann_whitney_test",
@@ -45,9 +66,16 @@ __all__ = [
     # correlation
     "spearman_correlation",
     "correlation_matrix_nonparametric",
+    "correlation_matrix_blocked",
+    "top_correlated_pairs",
+    "append_spearman",
+    "save_spearman_state",
+    "load_spearman_state",
     "kendall_corr",
     "distance_correlation",
     # resampling
     "bootstrap_ci",
+    "bootstrap_ci_streaming",
+    "bootstrap_blb",
     "permutation_test",
 ]
@@ -2,14 +2,34 @@
 
 from __future__ import annotations
 
+import json
+from concurrent.futures import Executor
+from pathlib import Path
+
 import numpy as np
 import pandas as pd
+from numpy.lib.format import open_memmap
 from scipy import stats
 from scipy.spatial.distance import pdist, squareform
 import matplotlib.pyplot as plt
 import seaborn as sns
 
-from ..utils.stats import as_float_array
+from ..utils.stats import _count_inversions, _tie_terms, as_float_array
+from .resampling import (
+    _block_sizes,
+    _collect_null,
+    _map_tasks,
+    _n_workers,
+    _stream_plan,
+)
+
+
+# Largest sample for which distance_correlation(method="auto") goes dense.
+_DCOV_DENSE_MAX_N = 512
+
+# Elements of a permuted distance matrix gathered at once in the dense
+# permutation path (~2 MB, cache-sized slices of rows).
+_DCOV_SLICE_ELEMENTS = 2**18
 
 
 # --- 6. Correlation Analysis ---
@@ -47,31 +67,322 @@ def spearman_correlation(x, y, x_name="X", y_name="Y", save_path: str = None) ->
     return {"rho": rho, "p_value": p_value, "figure": fig}
 
 
-def correlation_matrix_nonparametric(
-    df: pd.DataFrame, method: str = "spearman", save_path: str = None
-) -> dict:
-    """Correlation matrix and p-value matrix."""
-    cols = df.select_dtypes(include=[np.number]).columns
-    df_num = df[cols]
-
-    corr = df_num.corr(method=method)
-    p_mat = pd.DataFrame(np.zeros((len(cols), len(cols))), columns=cols, index=cols)
-
-    func = stats.spearmanr if method == "spearman" else stats.kendalltau
-
-    for i, c1 in enumerate(cols):
-        for j, c2 in enumerate(cols):
-            if i != j:
-                # dropna for pair
-                valid = df_num[[c1, c2]].dropna()
-                if len(valid) > 2:
-                    _, p = func(valid[c1], valid[c2])
-                    p_mat.iloc[i, j] = p
-                else:
-                    p_mat.iloc[i, j] = np.nan
+def _missing_patterns(values_t: np.ndarray) -> list[tuple[np.ndarray, np.ndarray]]:
+    """Group columns (rows of ``values_t``) by observed mask: ``(indices, mask)``."""
+    observed = ~np.isnan(values_t)
+    groups: dict[bytes, list[int]] = {}
+    for j, mask in enumerate(observed):
+        groups.setdefault(np.packbits(mask).tobytes(), []).append(j)
+    return [(np.array(cols), observed[cols[0]]) for cols in groups.values()]
+
+
+def _sorted_orders(
+    values_t: np.ndarray, cols: np.ndarray, rows: np.ndarray
+) -> np.ndarray:
+    """Observed row indices in ascending value order, one row per column."""
+    order = np.argsort(values_t[cols], axis=1)  # NaN sorts last
+    return order[:, : int(rows.sum())]
+
+
+def _subset_centered_ranks(
+    values_t: np.ndarray, cols: np.ndarray, order: np.ndarray, rows: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """Centered mid-ranks of ``cols`` on the row subset ``rows``, and their norms.
+
+    ``order`` is the columns' precomputed sort order; restricting it to
+    ``rows`` keeps it sorted, so ranks follow in O(n) without re-sorting.
+    Returns a ``(len(cols), rows.sum())`` array.
+    """
+    m = int(rows.sum())
+    keep = rows[order]
+    idx = order if keep.all() else order[keep].reshape(len(cols), m)
+    sorted_vals = np.take_along_axis(values_t[cols], idx, axis=1)
+
+    # Mid-rank of each tie run: mean of its first and last 1-based positions
+    pos = np.arange(m)[None, :]
+    change = np.ones_like(sorted_vals, dtype=bool)
+    change[:, 1:] = sorted_vals[:, 1:] != sorted_vals[:, :-1]
+    run_end = np.ones_like(change)
+    run_end[:, :-1] = change[:, 1:]
+    first = np.maximum.accumulate(np.where(change, pos, 0), axis=1)
+    last = np.minimum.accumulate(np.where(run_end, pos, m - 1)[:, ::-1], axis=1)
+    mid = (first + last[:, ::-1]) / 2 + 1 - (m + 1) / 2
+
+    ranks = np.empty((len(cols), m))
+    np.put_along_axis(ranks, (np.cumsum(rows) - 1)[idx], mid, axis=1)
+    return ranks, np.sqrt(np.sum(ranks**2, axis=1))
+
+
+def _ranked_side(values_t: np.ndarray) -> tuple[list, list, dict]:
+    """Missing patterns of ``values_t``, their sort orders and own-row data cache."""
+    patterns = _missing_patterns(values_t)
+    orders = [_sorted_orders(values_t, cols, rows) for cols, rows in patterns]
+    return patterns, orders, {}
+
+
+def _pattern_blocks(
+    values_t: np.ndarray, subset_func, other_t: np.ndarray = None, ranked: list = None
+):
+    """Yield ``(cols_a, cols_b, rows, data_a, data_b)`` per pair of missing patterns.
+
+    Columns are grouped by missing-value pattern and sorted once per group.
+    ``subset_func(values_t, cols, order, rows)`` turns a group's sort order
+    into per-column data on the rows both patterns observe; a group's result
+    on its own rows is computed once and shared by all its pairs. Pairs with
+    fewer than two shared rows are skipped; ``cols_a is cols_b`` within a group.
+    With ``other_t``, pairs run between the two column sets (a cross block).
+    ``ranked`` passes precomputed ``_ranked_side`` results, one per side, so
+    a tiled caller sorts every column block once.
+    """
+    sides = [values_t] if other_t is None else [values_t, other_t]
+    ranked = ranked or [_ranked_side(side) for side in sides]
+    patterns = [side_ranked[0] for side_ranked in ranked]
+
+    def data_on(side: int, g: int, rows: np.ndarray) -> tuple:
+        side_patterns, orders, own_data = ranked[side]
+        cols_g, rows_g = side_patterns[g]
+        if rows.sum() < rows_g.sum():
+            return subset_func(sides[side], cols_g, orders[g], rows)
+        if g not in own_data:
+            own_data[g] = subset_func(sides[side], cols_g, orders[g], rows)
+        return own_data[g]
+
+    last = len(sides) - 1
+    for a, (cols_a, rows_a) in enumerate(patterns[0]):
+        for b in range(a if other_t is None else 0, len(patterns[last])):
+            cols_b, rows_b = patterns[last][b]
+            rows = rows_a & rows_b
+            if rows.sum() < 2:
+                continue
+            yield cols_a, cols_b, rows, data_on(0, a, rows), data_on(last, b, rows)
+
+
+def _spearman_matrix(
+    values: np.ndarray, other: np.ndarray = None, ranked: list = None
+) -> np.ndarray:
+    """Pairwise-complete Spearman matrix from rank matrix products.
+
+    For every pair of missing patterns the shared rows' ranks are read off
+    the groups' sort orders and correlated with a single matrix product,
+    which matches per-pair ``dropna`` + ``spearmanr`` exactly. With
+    ``other`` the result is the cross block ``values`` x ``other``.
+    """
+    values_t = np.ascontiguousarray(values.T)
+    other_t = None if other is None else np.ascontiguousarray(other.T)
+    k_other = len(values_t) if other is None else len(other_t)
+    corr = np.full((len(values_t), k_other), np.nan)
+    for cols_a, cols_b, _, (ra, norm_a), (rb, norm_b) in _pattern_blocks(
+        values_t, _subset_centered_ranks, other_t, ranked
+    ):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            block = (ra @ rb.T) / np.outer(norm_a, norm_b)
+        block = np.clip(block, -1.0, 1.0)
+        corr[np.ix_(cols_a, cols_b)] = block
+        if other is None:
+            corr[np.ix_(cols_b, cols_a)] = block.T
+    return corr
+
+
+def _subset_dense_ranks(
+    values_t: np.ndarray, cols: np.ndarray, order: np.ndarray, rows: np.ndarray
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Dense ranks of ``cols`` on the row subset ``rows``, with sort order and ties.
+
+    Returns 0-based dense ranks in subset row order, the subset positions in
+    ascending value order (read off the precomputed ``order``) and the
+    ``_tie_terms`` of every column.
+    """
+    m = int(rows.sum())
+    keep = rows[order]
+    idx = order if keep.all() else order[keep].reshape(len(cols), m)
+    sorted_vals = np.take_along_axis(values_t[cols], idx, axis=1)
+    change = np.ones_like(sorted_vals, dtype=bool)
+    change[:, 1:] = sorted_vals[:, 1:] != sorted_vals[:, :-1]
+
+    sub_order = (np.cumsum(rows) - 1)[idx]
+    ranks = np.empty((len(cols), m), dtype=np.int64)
+    np.put_along_axis(ranks, sub_order, np.cumsum(change, axis=1) - 1, axis=1)
+    return ranks, sub_order, _tie_terms(change)
+
+
+def _kendall_worker(
+    x_ranks: np.ndarray, x_orders: np.ndarray, y_ranks: np.ndarray, first_y: list[int]
+) -> list[tuple[np.ndarray, np.ndarray]]:
+    """Discordant and joint-tie pair counts of each x column against y columns.
+
+    Each y column is laid out in the x column's sort order and its strict
+    inversions are the discordant pairs (Knight's algorithm). When x has
+    ties, rows are re-sorted by the composite ``(x, y)`` key first so tied x
+    values contribute no inversions; equal keys are the joint ties.
+    Column ``i`` is paired with ``y_ranks[first_y[i]:]``.
+    """
+    m = x_ranks.shape[1]
+    results = []
+    for x_rank, x_order, start in zip(x_ranks, x_orders, first_y):
+        x_sorted = x_rank[x_order]
+        x_tied = x_sorted[-1] < m - 1
+        discordant, joint_ties = [], []
+        for size in _block_sizes(len(y_ranks) - start, m):
+            block = y_ranks[start : start + size][:, x_order]
+            if x_tied:
+                block = np.sort(x_sorted * m + block, axis=1)
+                change = np.ones_like(block, dtype=bool)
+                change[:, 1:] = block[:, 1:] != block[:, :-1]
+                joint_ties.append(_tie_terms(change)[0])
+                block %= m
             else:
-                p_mat.iloc[i, j] = 0.0  # self p-value
-
+                joint_ties.append(np.zeros(size, dtype=np.int64))
+            discordant.append(_count_inversions(block))
+            start += size
+        results.append(
+            (np.concatenate(discordant or [[]]), np.concatenate(joint_ties or [[]]))
+        )
+    return results
+
+
+def _kendall_matrix(
+    values: np.ndarray,
+    n_jobs: int = 1,
+    executor: Executor = None,
+    other: np.ndarray = None,
+    ranked: list = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Pairwise-complete Kendall tau-b and p-value matrices.
+
+    Every column is sorted once per missing pattern; pair counts come from
+    ``_kendall_worker`` (column groups spread over ``n_jobs`` processes) and
+    tau-b plus scipy's asymptotic p-values are evaluated for all pairs at
+    once. Untied pairs that scipy tests exactly (``n <= 33`` or near-perfect
+    order) are delegated to ``stats.kendalltau``. With ``other`` the result
+    is the cross block ``values`` x ``other``.
+    """
+    square = other is None
+    other = values if square else other
+    values_t = np.ascontiguousarray(values.T)
+    other_t = values_t if square else np.ascontiguousarray(other.T)
+    shape = (len(values_t), len(other_t))
+    n_obs = np.zeros(shape, dtype=np.int64)
+    discordant = np.zeros(shape, dtype=np.int64)
+    joint_ties = np.zeros(shape, dtype=np.int64)
+    x_ties = np.zeros((3, *shape), dtype=np.int64)
+    y_ties = np.zeros((3, *shape), dtype=np.int64)
+
+    n_groups = _n_workers(n_jobs, executor)
+    tasks, targets = [], []
+    for cols_a, cols_b, rows, (ra, oa, ta), (rb, _, tb) in _pattern_blocks(
+        values_t, _subset_dense_ranks, None if square else other_t, ranked
+    ):
+        n_obs[np.ix_(cols_a, cols_b)] = rows.sum()
+        x_ties[:, cols_a[:, None], cols_b] = ta[:, :, None]
+        y_ties[:, cols_a[:, None], cols_b] = tb[:, None, :]
+        if square:
+            n_obs[np.ix_(cols_b, cols_a)] = rows.sum()
+            x_ties[:, cols_b[:, None], cols_a] = tb[:, :, None]
+            y_ties[:, cols_b[:, None], cols_a] = ta[:, None, :]
+        same = cols_a is cols_b
+        for g in range(min(n_groups, len(cols_a))):
+            xs = np.arange(g, len(cols_a), n_groups)
+            first_y = [x + 1 if same else 0 for x in xs]
+            tasks.append((ra[xs], oa[xs], rb, first_y))
+            targets.append((cols_a[xs], cols_b, first_y))
+
+    for (xs, ys, first_y), result in zip(
+        targets, _map_tasks(_kendall_worker, tasks, n_jobs, executor)
+    ):
+        for i, start, (dis, joint) in zip(xs, first_y, result):
+            discordant[i, ys[start:]] = dis
+            joint_ties[i, ys[start:]] = joint
+            if square:
+                discordant[ys[start:], i] = dis
+                joint_ties[ys[start:], i] = joint
+
+    if square:
+        pair_i, pair_j = np.triu_indices(shape[0], k=1)
+    else:
+        pair_i, pair_j = (idx.ravel() for idx in np.indices(shape))
+    n = n_obs[pair_i, pair_j]
+    dis = discordant[pair_i, pair_j]
+    xt, yt = x_ties[:, pair_i, pair_j], y_ties[:, pair_i, pair_j]
+    tot = n * (n - 1) // 2
+    con_minus_dis = tot - xt[0] - yt[0] + joint_ties[pair_i, pair_j] - 2 * dis
+    valid = (n >= 2) & (xt[0] < tot) & (yt[0] < tot)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        tau = con_minus_dis / np.sqrt(tot - xt[0]) / np.sqrt(tot - yt[0])
+        m = n * (n - 1.0)
+        var = (
+            (m * (2 * n + 5) - xt[2] - yt[2]) / 18
+            + 2.0 * xt[0] * yt[0] / m
+            + xt[1] * yt[1] / (9 * m * (n - 2))
+        )
+        p = 2 * stats.norm.sf(np.abs(con_minus_dis / np.sqrt(var)))
+    tau = np.where(valid, np.clip(tau, -1.0, 1.0), np.nan)
+    p = np.where(valid & (n > 2), p, np.nan)
+
+    exact = (
+        valid
+        & (n > 2)
+        & (xt[0] == 0)
+        & (yt[0] == 0)
+        & ((n <= 33) | (np.minimum(dis, tot - dis) <= 1))
+    )
+    for pos in np.flatnonzero(exact):
+        x, y = values[:, pair_i[pos]], other[:, pair_j[pos]]
+        pair = ~np.isnan(x) & ~np.isnan(y)
+        p[pos] = stats.kendalltau(x[pair], y[pair]).pvalue
+
+    corr = np.full(shape, np.nan)
+    p_values = np.zeros(shape)
+    corr[pair_i, pair_j] = tau
+    p_values[pair_i, pair_j] = p
+    if square:
+        corr[pair_j, pair_i] = tau
+        p_values[pair_j, pair_i] = p
+        np.fill_diagonal(corr, np.where(np.isnan(values).all(axis=0), np.nan, 1.0))
+    return corr, p_values
+
+
+def _rank_corr_pvalues(corr: np.ndarray, n_obs: np.ndarray) -> np.ndarray:
+    """Two-sided t-approximation p-values for Spearman correlations (as scipy)."""
+    dof = n_obs - 2
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = corr * np.sqrt((dof / ((corr + 1.0) * (1.0 - corr))).clip(0))
+        p = 2 * stats.t.sf(np.abs(t), dof)
+    return np.where(n_obs > 2, p, np.nan)
+
+
+def _rank_corr_block(
+    values: np.ndarray,
+    method: str,
+    n_jobs: int = 1,
+    executor: Executor = None,
+    other: np.ndarray = None,
+    ranked: list = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Spearman or Kendall correlations and p-values (square or cross block).
+
+    Square Spearman blocks evaluate p-values on the upper triangle only.
+    ``ranked`` holds cached ``_ranked_side`` results for the column sets.
+    """
+    if method == "kendall":
+        return _kendall_matrix(
+            values, n_jobs=n_jobs, executor=executor, other=other, ranked=ranked
+        )
+    observed = (~np.isnan(values)).astype(float)
+    observed_other = observed if other is None else (~np.isnan(other)).astype(float)
+    corr = _spearman_matrix(values, other, ranked)
+    n_obs = observed.T @ observed_other
+    if other is not None:
+        return corr, _rank_corr_pvalues(corr, n_obs)
+    p_values = np.zeros_like(corr)  # self p-value stays 0.0
+    tri_i, tri_j = np.triu_indices(len(corr), k=1)
+    tri_p = _rank_corr_pvalues(corr[tri_i, tri_j], n_obs[tri_i, tri_j])
+    p_values[tri_i, tri_j] = tri_p
+    p_values[tri_j, tri_i] = tri_p
+    return corr, p_values
+
+
+def _correlation_heatmaps(corr: pd.DataFrame, p_mat: pd.DataFrame, method: str):
+    """Annotated lower-triangle heatmaps of correlations and p-values."""
     fig, axes = plt.subplots(1, 2, figsize=(16, 6))
     mask = np.triu(np.ones_like(corr, dtype=bool), k=1)
 
@@ -99,6 +410,52 @@ def correlation_matrix_nonparametric(
     )
     axes[1].set_title("p-value (Green < 0.05)")
     plt.tight_layout()
+    return fig
+
+
+def correlation_matrix_nonparametric(
+    df: pd.DataFrame,
+    method: str = "spearman",
+    save_path: str = None,
+    n_jobs: int = 1,
+    executor: Executor = None,
+) -> dict:
+    """
+    Correlation matrix and p-value matrix.
+
+    Spearman ranks every column once per missing-value pattern, builds the
+    matrix from one product of centered ranks and computes all p-values in a
+    single vectorized step (pair sizes come from the observed-mask product).
+    Kendall sorts every column once and counts discordant pairs by merge
+    sort (tau-b with tie corrections); column pairs are spread over
+    ``n_jobs`` worker processes or ``executor``.
+    """
+    cols = df.select_dtypes(include=[np.number]).columns
+    df_num = df[cols]
+
+    if method in ("spearman", "kendall"):
+        corr_values, p_values = _rank_corr_block(
+            df_num.to_numpy(dtype=float), method, n_jobs=n_jobs, executor=executor
+        )
+        corr = pd.DataFrame(corr_values, columns=cols, index=cols)
+        p_mat = pd.DataFrame(p_values, columns=cols, index=cols)
+    else:
+        corr = df_num.corr(method=method)
+        p_mat = pd.DataFrame(np.zeros((len(cols), len(cols))), columns=cols, index=cols)
+        for i, c1 in enumerate(cols):
+            for j, c2 in enumerate(cols):
+                if i != j:
+                    # dropna for pair
+                    valid = df_num[[c1, c2]].dropna()
+                    if len(valid) > 2:
+                        _, p = stats.kendalltau(valid[c1], valid[c2])
+                        p_mat.iloc[i, j] = p
+                    else:
+                        p_mat.iloc[i, j] = np.nan
+                else:
+                    p_mat.iloc[i, j] = 0.0  # self p-value
+
+    fig = _correlation_heatmaps(corr, p_mat, method)
 
     if save_path:
         plt.savefig(save_path, bbox_inches="tight")
@@ -107,6 +464,322 @@ def correlation_matrix_nonparametric(
     return {"correlation": corr, "p_values": p_mat, "figure": fig}
 
 
+def correlation_matrix_blocked(
+    df: pd.DataFrame,
+    out_dir: str,
+    method: str = "spearman",
+    block_size: int = 1000,
+    resume: bool = True,
+    max_heatmap_cols: int = 50,
+    save_path: str = None,
+    n_jobs: int = 1,
+    executor: Executor = None,
+) -> dict:
+    """
+    Tiled correlation and p-value matrices for very wide tables.
+
+    Columns are cut into blocks of ``block_size``; each upper tile and its
+    mirror are computed with the Spearman/Kendall engines and written into
+    ``out_dir/correlation.npy`` and ``out_dir/p_values.npy`` (opened as
+    ``np.memmap``). Every column block is sorted and ranked once and reused
+    by all its tiles (a block is released after its row of tiles). Finished
+    tiles are logged in ``tiles_done.txt``, so with ``resume=True`` an
+    interrupted run continues from the next tile. Heatmaps
+    are drawn only up to ``max_heatmap_cols`` columns; otherwise ``figure``
+    is None.
+    """
+    if method not in ("spearman", "kendall"):
+        raise ValueError("method must be 'spearman' or 'kendall'.")
+    if block_size < 1:
+        raise ValueError("block_size must be >= 1.")
+    cols = df.select_dtypes(include=[np.number]).columns
+    values = df[cols].to_numpy(dtype=float)
+    k = len(cols)
+
+    out = Path(out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    manifest = {
+        "method": method,
+        "block_size": block_size,
+        "n_rows": len(values),
+        "columns": [str(c) for c in cols],
+    }
+    manifest_path = out / "manifest.json"
+    done_path = out / "tiles_done.txt"
+    corr_path, p_path = out / "correlation.npy", out / "p_values.npy"
+    paths = (manifest_path, done_path, corr_path, p_path)
+    if resume and all(path.exists() for path in paths):
+        if json.loads(manifest_path.read_text(encoding="utf-8")) != manifest:
+            raise ValueError(
+                "out_dir holds tiles of a different table or settings; "
+                "use resume=False."
+            )
+        mode, done = "r+", set(done_path.read_text(encoding="utf-8").split())
+    else:
+        manifest_path.write_text(json.dumps(manifest), encoding="utf-8")
+        done_path.write_text("", encoding="utf-8")
+        mode, done = "w+", set()
+    corr = open_memmap(corr_path, mode=mode, dtype=float, shape=(k, k))
+    p_mat = open_memmap(p_path, mode=mode, dtype=float, shape=(k, k))
+
+    ranked_blocks: dict[int, tuple] = {}
+
+    def ranked_block(start: int) -> tuple:
+        if start not in ranked_blocks:
+            block_t = np.ascontiguousarray(values[:, start : start + block_size].T)
+            ranked_blocks[start] = _ranked_side(block_t)
+        return ranked_blocks[start]
+
+    starts = range(0, k, block_size)
+    for pos, i0 in enumerate(starts):
+        for j0 in starts[pos:]:
+            tile = f"{i0}:{j0}"
+            if tile in done:
+                continue
+            rows, cols_j = slice(i0, i0 + block_size), slice(j0, j0 + block_size)
+            square = i0 == j0
+            tile_corr, tile_p = _rank_corr_block(
+                values[:, rows],
+                method,
+                n_jobs=n_jobs,
+                executor=executor,
+                other=None if square else values[:, cols_j],
+                ranked=(
+                    [ranked_block(i0)]
+                    if square
+                    else [ranked_block(i0), ranked_block(j0)]
+                ),
+            )
+            corr[rows, cols_j] = tile_corr
+            p_mat[rows, cols_j] = tile_p
+            corr[cols_j, rows] = tile_corr.T
+            p_mat[cols_j, rows] = tile_p.T
+            corr.flush()
+            p_mat.flush()
+            with open(done_path, "a", encoding="utf-8") as log:
+                log.write(tile + "\n")
+        ranked_blocks.pop(i0, None)  # later tiles never touch block i0
+
+    fig = None
+    if k <= max_heatmap_cols:
+        fig = _correlation_heatmaps(
+            pd.DataFrame(np.asarray(corr), columns=cols, index=cols),
+            pd.DataFrame(np.asarray(p_mat), columns=cols, index=cols),
+            method,
+        )
+        if save_path:
+            plt.savefig(save_path, bbox_inches="tight")
+            plt.close()
+
+    return {
+        "correlation": corr,
+        "p_values": p_mat,
+        "columns": list(cols),
+        "figure": fig,
+    }
+
+
+def _bh_from_smallest(
+    p_values: np.ndarray, smallest: np.ndarray, n_tests: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """BH-adjusted p-values knowing only the ``K`` smallest of ``n_tests``.
+
+    For a p-value of rank ``r`` among the retained ``smallest`` the adjusted
+    value is ``min(p_(s) * n / s)`` over retained ``s >= r``; unseen p-values
+    cannot push it below ``smallest[-1]``, so it is exact when it does not
+    exceed that, and an upper bound otherwise. Returns ``(adjusted, exact)``.
+    """
+    smallest = np.sort(smallest)
+    if len(smallest) == 0:
+        return np.full(len(p_values), np.nan), np.zeros(len(p_values), dtype=bool)
+    steps = smallest * n_tests / np.arange(1, len(smallest) + 1)
+    tail_min = np.minimum.accumulate(steps[::-1])[::-1]
+    ranks = np.searchsorted(smallest, p_values, side="right") - 1
+    retained = (ranks >= 0) & (p_values <= smallest[-1])
+    adjusted = np.where(
+        retained,
+        tail_min[np.clip(ranks, 0, None)],
+        p_values * n_tests / (len(smallest) + 1),
+    )
+    exact = (retained & (adjusted <= smallest[-1])) | (len(smallest) == n_tests)
+    adjusted = np.where(np.isnan(p_values), np.nan, np.clip(adjusted, 0.0, 1.0))
+    return adjusted, exact & ~np.isnan(p_values)
+
+
+def top_correlated_pairs(
+    df: pd.DataFrame,
+    k_top: int = 100,
+    method: str = "spearman",
+    block_size: int = 1000,
+    n_jobs: int = 1,
+    executor: Executor = None,
+) -> dict:
+    """
+    Strongest ``k_top`` pairs by ``|rho|`` or ``|tau|``, without a full matrix.
+
+    Column blocks are streamed through the Spearman/Kendall engines one tile
+    at a time; only the current ``k_top`` strongest pairs and the
+    ``k_top + 1`` smallest p-values are kept, together with the count of
+    finite p-values, which is enough for Benjamini-Hochberg on the returned
+    pairs. ``bh_exact`` marks adjusted values that are exact (otherwise they
+    are conservative upper bounds). Memory grows with ``k_top`` and
+    ``block_size``, not with the number of column pairs.
+    """
+    if method not in ("spearman", "kendall"):
+        raise ValueError("method must be 'spearman' or 'kendall'.")
+    if k_top < 1 or block_size < 1:
+        raise ValueError("k_top and block_size must be >= 1.")
+    cols = df.select_dtypes(include=[np.number]).columns
+    values = df[cols].to_numpy(dtype=float)
+    k = len(cols)
+
+    best = np.empty((0, 4))  # columns: i, j, correlation, p-value
+    smallest = np.empty(0)
+    n_tests = 0
+    starts = range(0, k, block_size)
+    for pos, i0 in enumerate(starts):
+        for j0 in starts[pos:]:
+            other = None if i0 == j0 else values[:, j0 : j0 + block_size]
+            tile_corr, tile_p = _rank_corr_block(
+                values[:, i0 : i0 + block_size],
+                method,
+                n_jobs=n_jobs,
+                executor=executor,
+                other=other,
+            )
+            ti, tj = np.nonzero(
+                np.triu(np.ones(tile_corr.shape, dtype=bool), k=1)
+                if other is None
+                else np.ones(tile_corr.shape, dtype=bool)
+            )
+            rho, p = tile_corr[ti, tj], tile_p[ti, tj]
+            finite = np.isfinite(p)
+            n_tests += int(finite.sum())
+
+            candidates = np.concatenate(
+                [best, np.column_stack([ti + i0, tj + j0, rho, p])[~np.isnan(rho)]]
+            )
+            if len(candidates) > k_top:
+                keep = np.argpartition(-np.abs(candidates[:, 2]), k_top - 1)[:k_top]
+                candidates = candidates[keep]
+            best = candidates
+
+            pool = np.concatenate([smallest, p[finite]])
+            if len(pool) > k_top + 1:
+                pool = np.partition(pool, k_top)[: k_top + 1]
+            smallest = pool
+
+    best = best[np.argsort(-np.abs(best[:, 2]), kind="stable")]
+    p_adj, exact = _bh_from_smallest(best[:, 3], smallest, n_tests)
+    pairs = pd.DataFrame(
+        {
+            "var1": cols[best[:, 0].astype(int)],
+            "var2": cols[best[:, 1].astype(int)],
+            "correlation": best[:, 2],
+            "p_value": best[:, 3],
+            "p_adj": p_adj,
+            "bh_exact": exact,
+        }
+    )
+    return {"pairs": pairs, "n_tests": n_tests}
+
+
+def append_spearman(df: pd.DataFrame, state: dict = None) -> dict:
+    """
+    Spearman matrix for append-only data, with ranks kept across batches.
+
+    ``state`` keeps every column's sorted values, their row order and the
+    mid-rank matrix. Appending ``m`` rows merges them into the sorted index
+    with ``searchsorted`` (no re-sort of the history): old mid-ranks shift by
+    the number of smaller plus half the number of equal new values, and new
+    rows are ranked in the merged column, O(k * (n + m log m)) for ``k``
+    columns. Only the ranking is incremental: a batch shifts the rank of
+    every old row, so the matrix itself is one O(k^2 * n) product of the
+    maintained ranks per call.
+
+    Unlike ``correlation_matrix_nonparametric`` (pairwise-complete), rows
+    with any missing value are dropped from every pair (listwise); their
+    count per batch is returned as ``n_skipped``.
+    ``save_spearman_state``/``load_spearman_state`` persist the state.
+    """
+    cols = df.select_dtypes(include=[np.number]).columns
+    batch = df[cols].to_numpy(dtype=float)
+    complete = ~np.isnan(batch).any(axis=1)
+    batch = batch[complete]
+    if state is None:
+        state = {
+            "columns": np.array([str(c) for c in cols]),
+            "sorted": np.empty((len(cols), 0)),
+            "order": np.empty((len(cols), 0), dtype=np.int64),
+            "ranks": np.empty((len(cols), 0)),
+        }
+    elif [str(c) for c in cols] != state["columns"].tolist():
+        raise ValueError("df columns do not match the incremental state.")
+
+    n_old, m = state["ranks"].shape[1], len(batch)
+    sorted_vals = np.empty((len(cols), n_old + m))
+    order = np.empty((len(cols), n_old + m), dtype=np.int64)
+    ranks = np.empty((len(cols), n_old + m))
+    ranks[:, :n_old] = state["ranks"]
+    is_new = np.zeros(n_old + m, dtype=bool)
+    for j in range(len(cols)):
+        old_sorted, old_order = state["sorted"][j], state["order"][j]
+        new_order = np.argsort(batch[:, j], kind="stable")
+        new_sorted = batch[new_order, j]
+
+        # Old position i gains #{new < s_i} + #{new == s_i} / 2 in mid-rank
+        below = np.searchsorted(old_sorted, new_sorted, side="right")
+        at_or_below = np.searchsorted(old_sorted, new_sorted, side="left")
+        counts = np.bincount(below, minlength=n_old + 1)
+        counts += np.bincount(at_or_below, minlength=n_old + 1)
+        ranks[j, old_order] += np.cumsum(counts[:n_old]) / 2
+
+        slots = below + np.arange(m)
+        is_new[:] = False
+        is_new[slots] = True
+        sorted_vals[j, slots], sorted_vals[j, ~is_new] = new_sorted, old_sorted
+        order[j, slots], order[j, ~is_new] = new_order + n_old, old_order
+
+        left = np.searchsorted(sorted_vals[j], new_sorted, side="left")
+        right = np.searchsorted(sorted_vals[j], new_sorted, side="right")
+        ranks[j, new_order + n_old] = (left + right + 1) / 2
+    state = {**state, "sorted": sorted_vals, "order": order, "ranks": ranks}
+
+    n = n_old + m
+    centered = ranks - (n + 1) / 2
+    cross = centered @ centered.T
+    norms = np.sqrt(np.diag(cross))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        corr_values = np.clip(cross / np.outer(norms, norms), -1.0, 1.0)
+    p_values = _rank_corr_pvalues(corr_values, np.full(corr_values.shape, n))
+    np.fill_diagonal(p_values, 0.0)  # self p-value
+
+    return {
+        "correlation": pd.DataFrame(corr_values, columns=cols, index=cols),
+        "p_values": pd.DataFrame(p_values, columns=cols, index=cols),
+        "n": n,
+        "n_skipped": int((~complete).sum()),
+        "state": state,
+    }
+
+
+def _npz_path(path) -> Path:
+    """``path`` with the ``.npz`` suffix ``np.savez`` would append."""
+    path = Path(path)
+    return path if path.name.endswith(".npz") else path.with_name(path.name + ".npz")
+
+
+def save_spearman_state(state: dict, path: str) -> None:
+    """Write an ``append_spearman`` state to a ``.npz`` file."""
+    np.savez(_npz_path(path), **state)
+
+
+def load_spearman_state(path: str) -> dict:
+    """Read a state written by ``save_spearman_state``."""
+    with np.load(_npz_path(path), allow_pickle=False) as stored:
+        return {key: stored[key] for key in stored.files}
+
+
 def kendall_corr(x, y, x_name="X", y_name="Y", save_path: str = None) -> dict:
     """Kendall's Tau correlation."""
     x = as_float_array(x)
@@ -130,38 +803,193 @@ def kendall_corr(x, y, x_name="X", y_name="Y", save_path: str = None) -> dict:
     return {"correlation": tau, "p_value": p_value, "figure": fig}
 
 
-def distance_correlation(x, y, n_perm: int = 2000, save_path: str = None) -> dict:
-    """Distance Correlation with permutation test."""
+def _centered_distances(a: np.ndarray) -> np.ndarray:
+    """Double-centered n x n distance matrix of a univariate sample."""
+    A = squareform(pdist(a.reshape(-1, 1)))
+    return A - A.mean(0) - A.mean(1, keepdims=True) + A.mean()
+
+
+def _dominance_sums(ranks: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """``out[:, j] = sum(weights[:, i] for i < j if ranks[i] <= ranks[j])``.
+
+    Bottom-up merge sort on ``ranks``: at every level each right-run entry
+    collects the running weight sum of the left-run entries merged before it.
+    O(n log n) time and O(n) memory per weight row.
+    """
+    k, n = weights.shape
+    size = 1 << int(max(n, 2) - 1).bit_length()
+    keys = np.full(size, np.iinfo(np.int64).max >> 1, dtype=np.int64)
+    keys[:n] = ranks
+    keys <<= 1
+    padded = np.zeros((k, size))
+    padded[:, :n] = weights
+    out = np.zeros((k, size))
+    idx = np.arange(size)
+    width = 1
+    while width < size:
+        runs = idx.reshape(-1, 2 * width)
+        tagged = keys[runs] | (np.arange(2 * width) >= width)
+        order = np.argsort(tagged, axis=-1, kind="stable")
+        runs = np.take_along_axis(runs, order, axis=-1)
+        left = order < width
+        running = np.cumsum(np.where(left, padded[:, runs], 0.0), axis=-1)
+        out[:, runs[~left]] += running[:, ~left]
+        idx = runs.ravel()
+        width *= 2
+    return out[:, :n]
+
+
+def _dcov_fast(a: np.ndarray, b: np.ndarray) -> float:
+    """Univariate sample distance covariance in O(n log n) time, O(n) memory.
+
+    Uses ``mean(A * B) = S1 / n^2 - 2 S2 / n^3 + a.. b.. / n^4`` with row sums
+    ``a_i. = x_i (2k - n) + sum(x) - 2 sum(x before i)`` from the sorted
+    order and ``S1 = 2 sum_{i<j} |dx| |dy|`` from dominance sums over
+    ``b`` laid out in ``a``'s order (Huo & Szekely, 2016).
+    """
+    n = len(a)
+    if n < 2:
+        return 0.0
+    order = np.argsort(a, kind="stable")
+    x = a[order] - a.mean()
+    y = b[order] - b.mean()
+
+    def row_sums(v: np.ndarray) -> np.ndarray:
+        v_order = np.argsort(v, kind="stable")
+        v_sorted = v[v_order]
+        before = np.cumsum(v_sorted) - v_sorted
+        sums = np.empty(n)
+        sums[v_order] = v_sorted * (2 * np.arange(n) - n) + v_sorted.sum() - 2 * before
+        return sums
+
+    a_row, b_row = row_sums(x), row_sums(y)
+
+    # sum_{i<j} sign(y_j - y_i) w_i = 2 * dominated - preceding
+    weights = np.stack([np.ones(n), x, y, x * y])
+    dominated = _dominance_sums(stats.rankdata(y, method="dense"), weights)
+    preceding = np.cumsum(weights, axis=1) - weights
+    signed = 2 * dominated - preceding
+    s1 = 2 * np.sum(x * y * signed[0] + signed[3] - x * signed[2] - y * signed[1])
+
+    total = (
+        s1 / n**2 - 2 * np.dot(a_row, b_row) / n**3 + a_row.sum() * b_row.sum() / n**4
+    )
+    return np.sqrt(max(total, 0.0))
+
+
+def _dcor_stream_worker(
+    x: np.ndarray, y: np.ndarray, denom: float, streams: list
+) -> list:
+    """Permutation dCor values for a group of seeded streams (fast dCov)."""
+    results = []
+    for seed_seq, size in streams:
+        rng = np.random.default_rng(seed_seq)
+        block = np.zeros(size)
+        if denom > 0:
+            for i in range(size):
+                # Recalculating dcov_xy only, denominator is constant
+                block[i] = _dcov_fast(x, rng.permutation(y)) / denom
+        results.append(block)
+    return results
+
+
+def _dcor_dense_worker(
+    A: np.ndarray, B: np.ndarray, denom: float, chunk_size: int, streams: list
+) -> list:
+    """Permutation dCor values from precomputed centered distance matrices.
+
+    Permuting ``y`` by ``p`` permutes the rows and columns of ``B``, so each
+    permutation is ``sum(A * B[p][:, p]) / n^2``, accumulated over slices of
+    ``chunk_size`` rows (memory-bounded). Draws match ``rng.permutation(y)``.
+    """
+    n = len(A)
+    if chunk_size is None:
+        chunk_size = max(1, _DCOV_SLICE_ELEMENTS // max(n, 1))
+    slices = _block_sizes(n, n, chunk_size)
+    results = []
+    for seed_seq, size in streams:
+        rng = np.random.default_rng(seed_seq)
+        block = np.zeros(size)
+        if denom > 0:
+            for i in range(size):
+                perm = rng.permutation(n)
+                total, row = 0.0, 0
+                for n_rows in slices:
+                    B_rows = B.take(perm[row : row + n_rows], axis=0).take(perm, axis=1)
+                    total += np.vdot(A[row : row + n_rows], B_rows)
+                    row += n_rows
+                block[i] = np.sqrt(max(total / n**2, 0.0)) / denom
+        results.append(block)
+    return results
+
+
+def distance_correlation(
+    x,
+    y,
+    n_perm: int = 2000,
+    save_path: str = None,
+    sequential: bool = False,
+    alpha: float = 0.05,
+    seed: int = None,
+    n_jobs: int = 1,
+    executor: Executor = None,
+    method: str = "auto",
+    chunk_size: int = None,
+) -> dict:
+    """
+    Distance Correlation with permutation test.
+
+    ``method="fast"`` computes dCov in O(n log n) time and O(n) memory from
+    sorted partial sums; ``"dense"`` builds the n x n distance matrices (the
+    reference path). ``"auto"`` uses the dense path only for small samples.
+    The dense path centers both matrices once and evaluates each permutation
+    by re-indexing ``B``, ``chunk_size`` rows at a time (memory-bounded).
+
+    ``sequential=True`` stops the permutation loop early once the p-value is
+    settled against ``alpha`` (see ``permutation_test``). Permutations run on
+    seeded streams, optionally across ``n_jobs`` processes or an
+    ``executor``, with results independent of the worker count.
+    """
     x = as_float_array(x)
     y = as_float_array(y)
     valid = ~np.isnan(x) & ~np.isnan(y)
     x, y = x[valid], y[valid]
 
-    def dcov(a, b):
-        A = squareform(pdist(a.reshape(-1, 1)))
-        A = A - A.mean(0) - A.mean(1, keepdims=True) + A.mean()
-        B = squareform(pdist(b.reshape(-1, 1)))
-        B = B - B.mean(0) - B.mean(1, keepdims=True) + B.mean()
-        return np.sqrt(np.mean(A * B))
-
-    dcov_xy = dcov(x, y)
-    dcov_xx = dcov(x, x)
-    dcov_yy = dcov(y, y)
-    dcor = dcov_xy / np.sqrt(dcov_xx * dcov_yy) if dcov_xx * dcov_yy > 0 else 0
+    if method == "auto":
+        method = "dense" if len(x) <= _DCOV_DENSE_MAX_N else "fast"
+    if method not in ("dense", "fast"):
+        raise ValueError("method must be 'auto', 'fast' or 'dense'.")
+
+    if method == "dense":
+        A, B = _centered_distances(x), _centered_distances(y)
+        dcov_xy = np.sqrt(max(np.mean(A * B), 0.0))
+        dcov_xx = np.sqrt(max(np.mean(A * A), 0.0))
+        dcov_yy = np.sqrt(max(np.mean(B * B), 0.0))
+    else:
+        dcov_xy = _dcov_fast(x, y)
+        dcov_xx = _dcov_fast(x, x)
+        dcov_yy = _dcov_fast(y, y)
+    denom = np.sqrt(dcov_xx * dcov_yy)
+    dcor = dcov_xy / denom if denom > 0 else 0
 
     # Permutation Test
-    perm_dcors = np.zeros(n_perm)
-    y_shuffled = y.copy()
-    for i in range(n_perm):
-        np.random.shuffle(y_shuffled)
-        # Recalculating dcov_xy only, denominator is constant (dcov_yy same)
-        perm_dcors[i] = (
-            dcov(x, y_shuffled) / np.sqrt(dcov_xx * dcov_yy)
-            if dcov_xx * dcov_yy > 0
-            else 0
-        )
+    if method == "dense":
+        worker, args = _dcor_dense_worker, (A, B, denom, chunk_size)
+    else:
+        worker, args = _dcor_stream_worker, (x, y, denom)
+    perm_dcors, n_exceed, n_used = _collect_null(
+        worker,
+        args,
+        _stream_plan(seed, n_perm),
+        lambda block: block >= dcor,
+        sequential,
+        alpha,
+        n_jobs,
+        executor,
+    )
 
-    p_value = np.mean(perm_dcors >= dcor)
+    p_value = n_exceed / n_used if n_used else np.nan
+    mc_se = np.sqrt(p_value * (1 - p_value) / n_used) if n_used else np.nan
 
     fig, axes = plt.subplots(1, 2, figsize=(12, 5))
     axes[0].scatter(x, y, alpha=0.6, s=60)
@@ -177,4 +1005,10 @@ def distance_correlation(x, y, n_perm: int = 2000, save_path: str = None) -> dic
         plt.savefig(save_path, bbox_inches="tight")
         plt.close()
 
-    return {"dcor": dcor, "p_value": p_value, "figure": fig}
+    return {
+        "dcor": dcor,
+        "p_value": p_value,
+        "n_perm_used": n_used,
+        "mc_se": mc_se,
+        "figure": fig,
+    }
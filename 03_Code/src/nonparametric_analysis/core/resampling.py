@@ -2,12 +2,329 @@
 
 from __future__ import annotations
 
+import functools
+import math
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+
 import numpy as np
+import pandas as pd
+from scipy import stats
 import matplotlib.pyplot as plt
 
 from ..utils.stats import as_float_array
 
 
+# Upper bound on elements in one resample block (~32 MB of float64).
+_BLOCK_ELEMENTS = 2**22
+
+# Sequential Monte Carlo p-values: resamples between stopping checks and the
+# Clopper-Pearson confidence used to decide that p is settled against alpha.
+_SEQUENTIAL_BLOCK = 100
+_SEQUENTIAL_CONFIDENCE = 0.999
+
+# Cap on cells of the shift-algorithm table (subset size x attainable sums).
+_EXACT_MAX_CELLS = 10**7
+
+# Resamples per independent random stream. Streams are spawned from one
+# SeedSequence, so results depend on the seed but not on worker count or
+# chunk_size.
+_STREAM_SIZE = 256
+
+
+def _is_axis_statistic(stat_func) -> bool:
+    """Check that ``stat_func(block, axis=-1)`` matches row-wise scalar calls."""
+    probe = np.array([[3.0, 1.0, 2.0, 7.0, 5.0], [0.5, 4.0, 4.0, 1.0, 9.0]])
+    try:
+        batched = np.asarray(stat_func(probe, axis=-1), dtype=float)
+        rowwise = np.array([stat_func(row) for row in probe], dtype=float)
+    except (TypeError, ValueError):
+        return False
+    return batched.shape == rowwise.shape and np.allclose(batched, rowwise)
+
+
+def _block_sizes(n_rows: int, row_length: int, chunk_size: int = None) -> list[int]:
+    """Split ``n_rows`` resamples into blocks of at most ``chunk_size`` rows."""
+    if chunk_size is None:
+        chunk_size = max(1, _BLOCK_ELEMENTS // max(row_length, 1))
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be >= 1.")
+    full, rest = divmod(n_rows, chunk_size)
+    return [chunk_size] * full + ([rest] if rest else [])
+
+
+def _stream_plan(seed, n_rows: int) -> list[tuple[np.random.SeedSequence, int]]:
+    """Split ``n_rows`` resamples into seeded streams of ``_STREAM_SIZE`` rows."""
+    sizes = _block_sizes(n_rows, 1, _STREAM_SIZE)
+    return list(zip(np.random.SeedSequence(seed).spawn(len(sizes)), sizes))
+
+
+def _child_seed(seed_seq: np.random.SeedSequence) -> np.random.SeedSequence:
+    """Deterministic secondary stream of ``seed_seq`` (does not mutate it)."""
+    return np.random.SeedSequence(
+        seed_seq.entropy,
+        spawn_key=(*seed_seq.spawn_key, 0),
+        pool_size=seed_seq.pool_size,
+    )
+
+
+def _n_workers(n_jobs: int = 1, executor: Executor = None) -> int:
+    """Number of parallel tasks to create for ``n_jobs`` (``-1`` = all cores).
+
+    A user ``executor`` does not expose its size, so without an explicit
+    ``n_jobs`` it gets one task per CPU core.
+    """
+    if executor is not None and n_jobs in (None, 1):
+        n_jobs = -1
+    if n_jobs is None or n_jobs == 0:
+        n_jobs = 1
+    if n_jobs < 0:
+        n_jobs = max(1, (os.cpu_count() or 1) + 1 + n_jobs)
+    return n_jobs
+
+
+def _map_tasks(func, tasks: list[tuple], n_jobs: int = 1, executor: Executor = None):
+    """Run ``func(*task)`` for every task and return results in task order."""
+    if executor is not None:
+        return list(executor.map(func, *zip(*tasks))) if tasks else []
+    n_workers = min(_n_workers(n_jobs), len(tasks))
+    if n_workers <= 1:
+        return [func(*task) for task in tasks]
+    with ProcessPoolExecutor(max_workers=n_workers) as pool:
+        return list(pool.map(func, *zip(*tasks)))
+
+
+def _map_streams(
+    worker, args: tuple, streams: list, n_jobs: int = 1, executor: Executor = None
+) -> list:
+    """Run ``worker(*args, group)`` over contiguous stream groups, one per worker.
+
+    Returns the per-stream results flattened back into stream order.
+    """
+    n_groups = min(_n_workers(n_jobs, executor), len(streams)) or 1
+    bounds = np.linspace(0, len(streams), n_groups + 1).astype(int)
+    tasks = [(*args, streams[a:b]) for a, b in zip(bounds[:-1], bounds[1:]) if b > a]
+    return [
+        item for group in _map_tasks(worker, tasks, n_jobs, executor) for item in group
+    ]
+
+
+def _sequential_settled(n_exceed: int, n_used: int, alpha: float) -> bool:
+    """Whether the Clopper-Pearson interval of the running p-value excludes alpha."""
+    tail = (1 - _SEQUENTIAL_CONFIDENCE) / 2
+    lower = stats.beta.ppf(tail, n_exceed, n_used - n_exceed + 1) if n_exceed else 0.0
+    upper = (
+        stats.beta.ppf(1 - tail, n_exceed + 1, n_used - n_exceed)
+        if n_exceed < n_used
+        else 1.0
+    )
+    return upper < alpha or lower > alpha
+
+
+def _collect_null(
+    worker,
+    args: tuple,
+    streams: list,
+    is_extreme,
+    sequential: bool = False,
+    alpha: float = 0.05,
+    n_jobs: int = 1,
+    executor: Executor = None,
+) -> tuple[np.ndarray, int, int]:
+    """Gather null statistics stream by stream, stopping early in sequential mode.
+
+    ``worker(*args, group)`` returns one array per stream. The stopping rule is
+    checked about every ``_SEQUENTIAL_BLOCK`` values in stream order, so the
+    outcome does not depend on the worker count. Returns the null values
+    used, the number of extreme values and the number used.
+    """
+    # Sequential runs dispatch one round of streams per worker at a time
+    wave = max(_n_workers(n_jobs, executor) if sequential else len(streams), 1)
+    values, n_exceed, n_used = [], 0, 0
+    for start in range(0, len(streams), wave):
+        group = streams[start : start + wave]
+        for block in _map_streams(worker, args, group, n_jobs, executor):
+            n_pieces = max(1, -(-len(block) // _SEQUENTIAL_BLOCK))
+            for piece in np.array_split(block, n_pieces):
+                values.append(piece)
+                n_exceed += int(np.sum(is_extreme(piece)))
+                n_used += len(piece)
+                if sequential and _sequential_settled(n_exceed, n_used, alpha):
+                    return np.concatenate(values), n_exceed, n_used
+    return (np.concatenate(values) if values else np.empty(0)), n_exceed, n_used
+
+
+def _quantile_level(stat_func) -> float | None:
+    """Quantile level of median/quantile statistics, else None."""
+    if stat_func in (np.median, np.nanmedian):
+        return 0.5
+    if isinstance(stat_func, functools.partial) and not stat_func.args:
+        kwargs = stat_func.keywords
+        if set(kwargs) != {"q"} or np.ndim(kwargs["q"]) != 0:
+            return None
+        if stat_func.func in (np.quantile, np.nanquantile):
+            return float(kwargs["q"])
+        if stat_func.func in (np.percentile, np.nanpercentile):
+            return float(kwargs["q"]) / 100
+    return None
+
+
+def _jackknife_values(
+    clean_data: np.ndarray, stat_func, chunk_size: int = None
+) -> np.ndarray:
+    """Leave-one-out statistics (closed form for the mean and quantiles).
+
+    Only the multiset of values is meaningful; the order is not tied to the
+    removed observation.
+    """
+    n = len(clean_data)
+    if stat_func in (np.mean, np.nanmean):
+        return (clean_data.sum() - clean_data) / (n - 1)
+
+    q = _quantile_level(stat_func)
+    if q is not None:
+        # Linear interpolation on the n-1 remaining order statistics, where
+        # removing sorted position k shifts every later element down by one.
+        x = np.sort(clean_data)
+        k = np.arange(n)
+        h = q * (n - 2)
+        lo = int(np.floor(h))
+        hi = min(lo + 1, n - 2)
+        y_lo = np.where(lo < k, x[lo], x[min(lo + 1, n - 1)])
+        y_hi = np.where(hi < k, x[hi], x[min(hi + 1, n - 1)])
+        return y_lo + (h - lo) * (y_hi - y_lo)
+
+    if _is_axis_statistic(stat_func):
+        base = np.arange(n - 1)
+        jack = np.empty(n)
+        start = 0
+        for size in _block_sizes(n, n - 1, chunk_size):
+            rows = np.arange(start, start + size)[:, None]
+            idx = base[None, :] + (base[None, :] >= rows)
+            jack[start : start + size] = stat_func(clean_data[idx], axis=-1)
+            start += size
+        return jack
+
+    return np.array([stat_func(np.delete(clean_data, i)) for i in range(n)])
+
+
+def _replicate_se(
+    values: np.ndarray,
+    stat_func,
+    axis_ok: bool,
+    rng: np.random.Generator,
+    n_inner: int,
+) -> np.ndarray:
+    """Standard error of the statistic for every resample row of ``values``."""
+    m, n = values.shape
+    if stat_func in (np.mean, np.nanmean):
+        return values.std(axis=-1, ddof=1) / np.sqrt(n)
+    if axis_ok:
+        idx = rng.integers(0, n, size=(m, n_inner, n))
+        inner = np.take_along_axis(values[:, None, :], idx, axis=-1)
+        return stat_func(inner, axis=-1).std(axis=-1, ddof=1)
+    return np.array(
+        [
+            np.std(
+                [stat_func(row[rng.integers(0, n, size=n)]) for _ in range(n_inner)],
+                ddof=1,
+            )
+            for row in values
+        ]
+    )
+
+
+def _bootstrap_replicates(
+    clean_data: np.ndarray,
+    stat_func,
+    n_boot: int,
+    rng: np.random.Generator,
+    chunk_size: int = None,
+    se_rng: np.random.Generator = None,
+    n_inner: int = 50,
+) -> tuple[np.ndarray, np.ndarray | None]:
+    """Bootstrap replicates, evaluated block-wise for axis-aware statistics.
+
+    When ``se_rng`` is given, each replicate also gets a standard error (for
+    bootstrap-t) from a nested bootstrap drawn from ``se_rng`` so the outer
+    resamples stay identical to the plain percentile run.
+    """
+    n = len(clean_data)
+    axis_ok = _is_axis_statistic(stat_func)
+    boots = np.empty(n_boot)
+    ses = np.empty(n_boot) if se_rng is not None else None
+
+    if axis_ok:
+        row_length = n
+        if se_rng is not None and stat_func not in (np.mean, np.nanmean):
+            row_length = n * (n_inner + 1)
+        start = 0
+        for size in _block_sizes(n_boot, row_length, chunk_size):
+            values = clean_data[rng.integers(0, n, size=(size, n))]
+            boots[start : start + size] = stat_func(values, axis=-1)
+            if ses is not None:
+                ses[start : start + size] = _replicate_se(
+                    values, stat_func, axis_ok, se_rng, n_inner
+                )
+            start += size
+    else:
+        # Scalar fallback for statistics without an ``axis`` argument
+        for i in range(n_boot):
+            sample = clean_data[rng.integers(0, n, size=n)]
+            boots[i] = stat_func(sample)
+            if ses is not None:
+                ses[i] = _replicate_se(
+                    sample[None, :], stat_func, axis_ok, se_rng, n_inner
+                )[0]
+    return boots, ses
+
+
+def _bootstrap_stream_worker(
+    clean_data: np.ndarray,
+    stat_func,
+    chunk_size: int,
+    studentized: bool,
+    n_inner: int,
+    streams: list,
+) -> list:
+    """Bootstrap replicates (and SEs) for a group of seeded streams."""
+    results = []
+    for seed_seq, size in streams:
+        rng = np.random.default_rng(seed_seq)
+        se_rng = np.random.default_rng(_child_seed(seed_seq)) if studentized else None
+        results.append(
+            _bootstrap_replicates(
+                clean_data, stat_func, size, rng, chunk_size, se_rng, n_inner
+            )
+        )
+    return results
+
+
+def _bca_interval(
+    clean_data: np.ndarray,
+    boots: np.ndarray,
+    obs: float,
+    stat_func,
+    ci: float,
+    chunk_size: int = None,
+) -> tuple[float, float]:
+    """Bias-corrected and accelerated percentile interval."""
+    n_boot = len(boots)
+    prop = (np.sum(boots < obs) + 0.5 * np.sum(boots == obs)) / n_boot
+    prop = np.clip(prop, 0.5 / n_boot, 1 - 0.5 / n_boot)
+    z0 = stats.norm.ppf(prop)
+
+    jack = _jackknife_values(clean_data, stat_func, chunk_size)
+    d = jack.mean() - jack
+    denom = 6 * np.sum(d**2) ** 1.5
+    a = np.sum(d**3) / denom if denom > 0 else 0.0
+
+    z = stats.norm.ppf([(100 - ci) / 200, 1 - (100 - ci) / 200])
+    adj = stats.norm.cdf(z0 + (z0 + z) / (1 - a * (z0 + z)))
+    lo, hi = np.percentile(boots, 100 * adj)
+    return lo, hi
+
+
 # --- 7. Resampling ---
 
 
@@ -19,24 +336,60 @@ def bootstrap_ci(
     seed: int = None,
     name: str = "Stat",
     save_path: str = None,
+    chunk_size: int = None,
+    method: str = "percentile",
+    n_inner: int = 50,
+    n_jobs: int = 1,
+    executor: Executor = None,
 ) -> dict:
-    """Bootstrap Confidence Interval."""
+    """
+    Bootstrap Confidence Interval.
+
+    Axis-aware statistics (``np.median``, ``np.mean``,
+    ``functools.partial(np.quantile, q=...)``,
+    ``functools.partial(stats.trim_mean, proportiontocut=...)``) are evaluated
+    on whole blocks of ``chunk_size`` resamples; other callables fall back to
+    a per-resample loop.
+
+    ``method`` is ``"percentile"``, ``"bca"`` (bias-corrected and
+    accelerated) or ``"studentized"`` (bootstrap-t; replicate SEs are
+    analytic for the mean and use ``n_inner`` nested resamples otherwise).
+    All methods share the same bootstrap replicates for a given ``seed``.
+
+    Resamples are split into fixed-size streams spawned from one
+    ``SeedSequence``; ``n_jobs`` worker processes (``-1`` = all cores) or a
+    user ``executor`` (``n_jobs`` tasks, one per core by default) run them,
+    and results are identical for any worker count. ``stat_func`` must be
+    picklable when running in parallel.
+    """
+    if method not in ("percentile", "bca", "studentized"):
+        raise ValueError(f"Unknown method: {method}")
+
     clean_data = as_float_array(data)
     clean_data = clean_data[~np.isnan(clean_data)]
 
-    if seed is not None:
-        np.random.seed(seed)
-
-    n = len(clean_data)
-    boots = np.zeros(n_boot)
-    for i in range(n_boot):
-        sample = np.random.choice(clean_data, n, replace=True)
-        boots[i] = stat_func(sample)
+    results = _map_streams(
+        _bootstrap_stream_worker,
+        (clean_data, stat_func, chunk_size, method == "studentized", n_inner),
+        _stream_plan(seed, n_boot),
+        n_jobs,
+        executor,
+    )
+    boots = np.concatenate([b for b, _ in results])
+    ses = np.concatenate([s for _, s in results]) if method == "studentized" else None
 
-    lo = np.percentile(boots, (100 - ci) / 2)
-    hi = np.percentile(boots, 100 - (100 - ci) / 2)
     obs = stat_func(clean_data)
     se = np.std(boots)
+    if method == "bca":
+        lo, hi = _bca_interval(clean_data, boots, obs, stat_func, ci, chunk_size)
+    elif method == "studentized":
+        valid = ses > 0
+        t_stats = (boots[valid] - obs) / ses[valid]
+        t_lo, t_hi = np.percentile(t_stats, [(100 - ci) / 2, 100 - (100 - ci) / 2])
+        lo, hi = obs - t_hi * se, obs - t_lo * se
+    else:
+        lo = np.percentile(boots, (100 - ci) / 2)
+        hi = np.percentile(boots, 100 - (100 - ci) / 2)
 
     fig, ax = plt.subplots(figsize=(10, 5))
     ax.hist(
@@ -46,7 +399,183 @@ def bootstrap_ci(
     ax.axvspan(
         lo, hi, alpha=0.2, color="orange", label=f"{ci}% CI: [{lo:.3f},{hi:.3f}]"
     )
-    ax.set_title(f"{name} Bootstrap ({n_boot})")
+    ax.set_title(f"{name} Bootstrap ({n_boot}, {method})")
+    ax.legend()
+    plt.tight_layout()
+
+    if save_path:
+        plt.savefig(save_path, bbox_inches="tight")
+        plt.close()
+
+    return {
+        "observed": obs,
+        "ci_lower": lo,
+        "ci_upper": hi,
+        "se": se,
+        "method": method,
+        "figure": fig,
+    }
+
+
+def _chunk_values(chunk, column: str = None) -> np.ndarray:
+    """Finite float values of one streamed chunk (array, Series or table)."""
+    if column is not None:
+        chunk = chunk[column]
+    elif isinstance(chunk, pd.DataFrame):
+        if chunk.shape[1] != 1:
+            raise ValueError("column is required for multi-column chunks.")
+        chunk = chunk.iloc[:, 0]
+    values = np.asarray(chunk, dtype=float).ravel()
+    return values[np.isfinite(values)]
+
+
+def _histogram_quantile(counts: np.ndarray, edges: np.ndarray, q: float) -> np.ndarray:
+    """Row-wise quantile of weighted histograms by linear interpolation in the bin."""
+    cum = np.cumsum(counts, axis=-1)
+    target = q * cum[:, -1]
+    idx = np.minimum((cum < target[:, None]).sum(axis=-1), counts.shape[-1] - 1)
+    rows = np.arange(len(counts))
+    before = np.where(idx > 0, cum[rows, np.maximum(idx - 1, 0)], 0.0)
+    in_bin = counts[rows, idx]
+    frac = np.divide(
+        target - before, in_bin, out=np.full(len(counts), 0.5), where=in_bin > 0
+    )
+    return edges[idx] + np.clip(frac, 0.0, 1.0) * (edges[idx + 1] - edges[idx])
+
+
+def _widen_histogram(
+    counts: np.ndarray, lo: float, width: float, v_min: float, v_max: float
+) -> tuple[np.ndarray, float, float]:
+    """Double the bin width, merging bin pairs, until ``[v_min, v_max]`` fits.
+
+    Merged bins keep their exact counts, so widening never moves a value
+    into the wrong bin; the range grows towards the side that overflowed.
+    """
+    bins = counts.shape[1]
+    while v_min < lo or v_max > lo + bins * width:
+        merged = counts.reshape(len(counts), bins // 2, 2).sum(axis=2)
+        counts = np.zeros_like(counts)
+        if v_min < lo:
+            counts[:, bins // 2 :] = merged
+            lo -= bins * width
+        else:
+            counts[:, : bins // 2] = merged
+        width *= 2
+    return counts, lo, width
+
+
+def bootstrap_ci_streaming(
+    chunks,
+    statistic="mean",
+    n_boot: int = 1000,
+    ci: int = 95,
+    seed: int = None,
+    column: str = None,
+    value_range: tuple[float, float] = None,
+    bins: int = 2048,
+    name: str = "Stat",
+    save_path: str = None,
+) -> dict:
+    """
+    One-pass Poisson bootstrap CI over an iterable of chunks.
+
+    ``chunks`` yields arrays, Series or DataFrames (``column`` selects the
+    values), e.g. ``pd.read_csv(path, chunksize=...)`` or Parquet row
+    groups. Every row gets an independent Poisson(1) weight per replicate,
+    and only per-replicate accumulators are kept, so memory is
+    O(n_boot) for ``"mean"`` / ``"sum"`` and O(n_boot * bins) for quantiles.
+
+    ``statistic`` is ``"mean"``, ``"sum"``, ``"median"`` or a quantile level
+    in [0, 1]. Quantiles use a weighted histogram of ``bins`` (even) bins
+    that starts on ``value_range`` (default: range of the first chunk).
+    Values outside it are never clipped: the bin width doubles, merging
+    bin pairs, until they fit, so the result is accurate to one final bin
+    width.
+    """
+    if isinstance(statistic, str):
+        if statistic not in ("mean", "sum", "median"):
+            raise ValueError(f"Unknown statistic: {statistic}")
+        q = 0.5 if statistic == "median" else None
+    else:
+        q = float(statistic)
+        if not 0 <= q <= 1:
+            raise ValueError("Quantile level must be in [0, 1].")
+    if q is not None and (bins < 2 or bins % 2):
+        raise ValueError("bins must be an even number >= 2.")
+
+    rng = np.random.default_rng(seed)
+    # Row 0 carries unit weights and yields the observed statistic
+    weight_sum = np.zeros(n_boot + 1)
+    value_sum = np.zeros(n_boot + 1)
+    counts = lo = width = None
+    n_total = 0
+
+    for chunk in chunks:
+        values = _chunk_values(chunk, column)
+        if len(values) == 0:
+            continue
+        if q is not None:
+            if counts is None:
+                lo, hi = (
+                    value_range
+                    if value_range is not None
+                    else (values.min(), values.max())
+                )
+                width = (hi - lo) / bins if hi > lo else 1.0 / bins
+                counts = np.zeros((n_boot + 1, bins))
+            counts, lo, width = _widen_histogram(
+                counts, lo, width, values.min(), values.max()
+            )
+
+        n_total += len(values)
+        start = 0
+        for size in _block_sizes(len(values), n_boot, None):
+            part = values[start : start + size]
+            start += size
+            weights = np.vstack(
+                [np.ones(size), rng.poisson(1.0, size=(n_boot, size))]
+            ).astype(float)
+            if q is None:
+                weight_sum += weights.sum(axis=-1)
+                value_sum += weights @ part
+            else:
+                bin_idx = np.clip(((part - lo) / width).astype(np.int64), 0, bins - 1)
+                flat = (np.arange(n_boot + 1)[:, None] * bins + bin_idx).ravel()
+                counts += np.bincount(
+                    flat, weights=weights.ravel(), minlength=(n_boot + 1) * bins
+                ).reshape(n_boot + 1, bins)
+
+    if n_total == 0:
+        raise ValueError("chunks contained no finite values.")
+
+    if q is not None:
+        estimates = _histogram_quantile(counts, lo + width * np.arange(bins + 1), q)
+    elif statistic == "sum":
+        estimates = value_sum
+    else:
+        estimates = np.divide(
+            value_sum, weight_sum, out=np.full(n_boot + 1, np.nan), where=weight_sum > 0
+        )
+    obs, boots = estimates[0], estimates[1:]
+
+    lo = np.nanpercentile(boots, (100 - ci) / 2)
+    hi = np.nanpercentile(boots, 100 - (100 - ci) / 2)
+    se = np.nanstd(boots)
+
+    fig, ax = plt.subplots(figsize=(10, 5))
+    ax.hist(
+        boots[np.isfinite(boots)],
+        bins=50,
+        density=True,
+        alpha=0.7,
+        color="steelblue",
+        edgecolor="white",
+    )
+    ax.axvline(obs, color="red", lw=2, label=f"Observed={obs:.3f}")
+    ax.axvspan(
+        lo, hi, alpha=0.2, color="orange", label=f"{ci}% CI: [{lo:.3f},{hi:.3f}]"
+    )
+    ax.set_title(f"{name} Poisson Bootstrap ({n_boot}, n={n_total})")
     ax.legend()
     plt.tight_layout()
 
@@ -54,7 +583,234 @@ def bootstrap_ci(
         plt.savefig(save_path, bbox_inches="tight")
         plt.close()
 
-    return {"observed": obs, "ci_lower": lo, "ci_upper": hi, "se": se, "figure": fig}
+    return {
+        "observed": obs,
+        "ci_lower": lo,
+        "ci_upper": hi,
+        "se": se,
+        "n": n_total,
+        "figure": fig,
+    }
+
+
+def _blb_subset_worker(
+    subset: np.ndarray,
+    n: int,
+    q: float | None,
+    n_boot: int,
+    ci: float,
+    seed_seq: np.random.SeedSequence,
+) -> np.ndarray:
+    """CI endpoints and SE from multinomial-weighted resamples of one subset."""
+    rng = np.random.default_rng(seed_seq)
+    b = len(subset)
+    estimates = np.empty(n_boot)
+    start = 0
+    for size in _block_sizes(n_boot, b, None):
+        weights = rng.multinomial(n, np.full(b, 1 / b), size=size)
+        if q is None:
+            estimates[start : start + size] = (weights @ subset) / n
+        else:
+            # ``subset`` is sorted, so the weighted quantile is the first
+            # point whose cumulative weight reaches q * n
+            cum = np.cumsum(weights, axis=-1)
+            idx = np.minimum((cum < q * n).sum(axis=-1), b - 1)
+            estimates[start : start + size] = subset[idx]
+        start += size
+    lo, hi = np.percentile(estimates, [(100 - ci) / 2, 100 - (100 - ci) / 2])
+    return np.array([lo, hi, np.std(estimates)])
+
+
+def bootstrap_blb(
+    data,
+    statistic="median",
+    gamma: float = 0.7,
+    n_subsets: int = 20,
+    n_boot: int = 100,
+    ci: int = 95,
+    seed: int = None,
+    n_jobs: int = 1,
+    executor: Executor = None,
+    name: str = "Stat",
+    save_path: str = None,
+) -> dict:
+    """
+    Bag of Little Bootstraps CI for very large samples.
+
+    ``n_subsets`` subsets of size ``b = n**gamma`` are drawn without
+    replacement; each is resampled ``n_boot`` times with multinomial(n)
+    weights, so one resample costs O(b) after a single O(b log b) sort
+    (weighted-quantile kernel). The interval endpoints and SE are averaged
+    over subsets. ``statistic`` is ``"mean"``, ``"median"`` or a quantile
+    level in [0, 1]. Subsets run on seeded streams across ``n_jobs``
+    processes or an ``executor``, reproducibly for a given ``seed``.
+    """
+    if isinstance(statistic, str):
+        if statistic not in ("mean", "median"):
+            raise ValueError(f"Unknown statistic: {statistic}")
+        q = 0.5 if statistic == "median" else None
+    else:
+        q = float(statistic)
+        if not 0 <= q <= 1:
+            raise ValueError("Quantile level must be in [0, 1].")
+    if not 0 < gamma <= 1:
+        raise ValueError("gamma must be in (0, 1].")
+
+    clean_data = as_float_array(data)
+    clean_data = clean_data[~np.isnan(clean_data)]
+    n = len(clean_data)
+    b = max(2, min(n, int(round(n**gamma))))
+
+    # Only the small sorted subsets are shipped to the workers
+    tasks = []
+    for seed_seq in np.random.SeedSequence(seed).spawn(n_subsets):
+        rng = np.random.default_rng(seed_seq)
+        subset = np.sort(clean_data[rng.choice(n, size=b, replace=False)])
+        tasks.append((subset, n, q, n_boot, ci, _child_seed(seed_seq)))
+    per_subset = np.array(_map_tasks(_blb_subset_worker, tasks, n_jobs, executor))
+
+    lo, hi, se = per_subset.mean(axis=0)
+    obs = np.mean(clean_data) if q is None else np.quantile(clean_data, q)
+
+    fig, ax = plt.subplots(figsize=(10, 5))
+    for i, (s_lo, s_hi, _) in enumerate(per_subset):
+        ax.hlines(i, s_lo, s_hi, colors="steelblue", lw=2, alpha=0.7)
+    ax.axvline(obs, color="red", lw=2, label=f"Observed={obs:.3f}")
+    ax.axvspan(
+        lo, hi, alpha=0.2, color="orange", label=f"{ci}% CI: [{lo:.3f},{hi:.3f}]"
+    )
+    ax.set_ylabel("Subset")
+    ax.set_title(f"{name} Bag of Little Bootstraps ({n_subsets} x b={b})")
+    ax.legend()
+    plt.tight_layout()
+
+    if save_path:
+        plt.savefig(save_path, bbox_inches="tight")
+        plt.close()
+
+    return {
+        "observed": obs,
+        "ci_lower": lo,
+        "ci_upper": hi,
+        "se": se,
+        "subset_size": b,
+        "figure": fig,
+    }
+
+
+def _iter_permutation_diffs(
+    combined: np.ndarray,
+    n1: int,
+    stat_func,
+    n_perm: int,
+    rng: np.random.Generator,
+    chunk_size: int = None,
+):
+    """Yield blocks of the permutation null of ``stat(group1) - stat(group2)``."""
+    n = len(combined)
+    axis_ok = _is_axis_statistic(stat_func)
+    total = combined.sum()
+    shuffled = combined.copy()
+    for size in _block_sizes(n_perm, n, chunk_size):
+        if not axis_ok:
+            # Scalar fallback for statistics without an ``axis`` argument
+            block = np.empty(size)
+            for i in range(size):
+                rng.shuffle(shuffled)
+                block[i] = stat_func(shuffled[:n1]) - stat_func(shuffled[n1:])
+            yield block
+            continue
+
+        idx = rng.permuted(np.broadcast_to(np.arange(n), (size, n)), axis=1)
+        if stat_func in (np.mean, np.nanmean):
+            # Group means follow from the group-1 sum alone
+            s1 = combined[idx[:, :n1]].sum(axis=-1)
+            yield s1 / n1 - (total - s1) / (n - n1)
+        else:
+            values = combined[idx]
+            yield stat_func(values[:, :n1], axis=-1) - stat_func(
+                values[:, n1:], axis=-1
+            )
+
+
+def _permutation_stream_worker(
+    combined: np.ndarray, n1: int, stat_func, chunk_size: int, streams: list
+) -> list:
+    """Permutation differences for a group of seeded streams."""
+    return [
+        np.concatenate(
+            list(
+                _iter_permutation_diffs(
+                    combined,
+                    n1,
+                    stat_func,
+                    size,
+                    np.random.default_rng(seed_seq),
+                    chunk_size,
+                )
+            )
+        )
+        for seed_seq, size in streams
+    ]
+
+
+@functools.lru_cache(maxsize=128)
+def _exact_sum_counts(scores: tuple[int, ...], k: int) -> np.ndarray:
+    """Counts of the size-``k`` subset sums of ``scores`` (shift algorithm)."""
+    max_sum = sum(sorted(scores)[len(scores) - k :])
+    counts = np.zeros((k + 1, max_sum + 1))
+    counts[0, 0] = 1.0
+    for v in scores:
+        # Overlapping in-place add acts on a copy, so each score is used once
+        counts[1:, v:] += counts[:-1, : max_sum + 1 - v]
+    result = counts[k]
+    result.setflags(write=False)
+    return result
+
+
+def _exact_permutation_null(
+    combined: np.ndarray, n1: int
+) -> tuple[float, np.ndarray, np.ndarray] | None:
+    """Exact two-sided p-value and null of the mean difference for sum statistics.
+
+    Applies to integer or half-integer scores (mid-ranks included); returns
+    None when the scores or the table size rule the shift algorithm out.
+    """
+    n = len(combined)
+    doubled = combined * 2
+    if n1 == 0 or n1 == n or not np.array_equal(doubled, np.round(doubled)):
+        return None
+    # Normalise to small non-negative integers so untied ranks share one key
+    ints = doubled.astype(np.int64)
+    offset = int(ints.min())
+    ints -= offset
+    scale = int(np.gcd.reduce(ints)) or 1
+    ints //= scale
+
+    # Enumerate subsets of the smaller group; the other sum is the complement
+    k = min(n1, n - n1)
+    sorted_ints = np.sort(ints)
+    if (k + 1) * (int(sorted_ints[n - k :].sum()) + 1) > _EXACT_MAX_CELLS:
+        return None
+    counts = _exact_sum_counts(tuple(sorted_ints.tolist()), k)
+
+    sums = np.arange(len(counts))
+    observed = int(ints[:n1].sum() if k == n1 else ints[n1:].sum())
+    expected = k * ints.mean()
+    extreme = np.abs(sums - expected) >= np.abs(observed - expected) - 1e-9
+    p_value = counts[extreme].sum() / counts.sum()
+
+    support = counts > 0
+    total = combined.sum()
+    group_sum = (sums[support] * scale + k * offset) / 2
+    sum1 = group_sum if k == n1 else total - group_sum
+    diffs = sum1 / n1 - (total - sum1) / (n - n1)
+    return p_value, diffs, counts[support] / counts.sum()
+
+
+def _log_comb(n: int, k: int) -> float:
+    """``log C(n, k)`` without building the (possibly huge) integer."""
+    return math.lgamma(n + 1) - math.lgamma(k + 1) - math.lgamma(n - k + 1)
 
 
 def permutation_test(
@@ -66,32 +822,127 @@ def permutation_test(
     name2="G2",
     seed: int = None,
     save_path: str = None,
+    chunk_size: int = None,
+    sequential: bool = False,
+    alpha: float = 0.05,
+    exact="auto",
+    exact_threshold: int = 10**7,
+    n_jobs: int = 1,
+    executor: Executor = None,
 ) -> dict:
-    """Permutation test for difference in statistic."""
+    """
+    Permutation test for difference in statistic.
+
+    ``stat_func`` may also be ``"median"``, ``"mean"`` or ``"ranksum"``
+    (difference in mean ranks of the pooled sample). Axis-aware statistics
+    are evaluated on blocks of ``chunk_size`` permutations at once.
+
+    With ``sequential=True`` the test checks about every 100 permutations
+    and stops early once a 99.9% Clopper-Pearson interval of the running
+    p-value lies entirely above or below ``alpha``; ``n_perm_used`` and
+    ``mc_se`` report the effort and the Monte Carlo standard error of the
+    p-value.
+
+    For ``"ranksum"`` and mean differences of integer-valued data the exact
+    null distribution is built with the shift algorithm (cached per score
+    set, so untied ranks are cached per ``(n1, n2)``). ``exact="auto"`` uses
+    it for ``"ranksum"`` when ``C(n1 + n2, n1) <= exact_threshold``;
+    ``exact=True`` requires it and also covers integer mean differences.
+
+    ``n_jobs`` / ``executor`` parallelise the permutations over seeded
+    streams as in ``bootstrap_ci``; early stopping is evaluated in stream
+    order, so the result does not depend on the worker count.
+    """
     g1 = as_float_array(group1)
     g1 = g1[~np.isnan(g1)]
     g2 = as_float_array(group2)
     g2 = g2[~np.isnan(g2)]
 
-    if seed is not None:
-        np.random.seed(seed)
-
-    obs_diff = stat_func(g1) - stat_func(g2)
     combined = np.concatenate([g1, g2])
     n1 = len(g1)
+    if isinstance(stat_func, str):
+        if stat_func not in ("median", "mean", "ranksum"):
+            raise ValueError(f"Unknown statistic: {stat_func}")
+        ranksum = stat_func == "ranksum"
+        if ranksum:
+            combined = stats.rankdata(combined)
+        stat_func = np.median if stat_func == "median" else np.mean
+    else:
+        ranksum = False
 
-    perms = np.zeros(n_perm)
-    for i in range(n_perm):
-        np.random.shuffle(combined)
-        p1 = combined[:n1]
-        p2 = combined[n1:]
-        perms[i] = stat_func(p1) - stat_func(p2)
+    obs_diff = stat_func(combined[:n1]) - stat_func(combined[n1:])
 
-    p_value = np.mean(np.abs(perms) >= np.abs(obs_diff))
+    exact_null = None
+    n_total = len(combined)
+    if exact is True or (
+        exact == "auto"
+        and ranksum
+        and _log_comb(n_total, n1) <= math.log(exact_threshold)
+    ):
+        if stat_func in (np.mean, np.nanmean):
+            exact_null = _exact_permutation_null(combined, n1)
+        if exact is True and exact_null is None:
+            raise ValueError(
+                "Exact mode needs stat_func='ranksum' or a mean of integer data."
+            )
+    if exact_null is not None:
+        p_value, perms, weights = exact_null
+        return _permutation_result(
+            obs_diff,
+            p_value,
+            perms,
+            weights,
+            math.comb(n_total, n1),
+            0.0,
+            name1,
+            name2,
+            save_path,
+            exact=True,
+        )
 
+    # Relative tolerance keeps ties with the observed split from being lost
+    # to summation-order rounding.
+    threshold = np.abs(obs_diff) * (1 - 1e-12)
+    perms, n_exceed, n_used = _collect_null(
+        _permutation_stream_worker,
+        (combined, n1, stat_func, chunk_size),
+        _stream_plan(seed, n_perm),
+        lambda block: np.abs(block) >= threshold,
+        sequential,
+        alpha,
+        n_jobs,
+        executor,
+    )
+
+    p_value = n_exceed / n_used if n_used else np.nan
+    mc_se = np.sqrt(p_value * (1 - p_value) / n_used) if n_used else np.nan
+    return _permutation_result(
+        obs_diff, p_value, perms, None, n_used, mc_se, name1, name2, save_path
+    )
+
+
+def _permutation_result(
+    obs_diff: float,
+    p_value: float,
+    perms: np.ndarray,
+    weights: np.ndarray | None,
+    n_used: int,
+    mc_se: float,
+    name1: str,
+    name2: str,
+    save_path: str = None,
+    exact: bool = False,
+) -> dict:
+    """Plot the permutation null and assemble the result dict."""
     fig, ax = plt.subplots(figsize=(10, 5))
     ax.hist(
-        perms, bins=50, density=True, alpha=0.7, color="lightgreen", edgecolor="white"
+        perms,
+        bins=50,
+        weights=weights,
+        density=True,
+        alpha=0.7,
+        color="lightgreen",
+        edgecolor="white",
     )
     ax.axvline(obs_diff, color="red", lw=2, label=f"Diff={obs_diff:.3f}")
     ax.set_title(f"Permutation: {name1} vs {name2} (p={p_value:.4f})")
@@ -102,4 +953,11 @@ def permutation_test(
         plt.savefig(save_path, bbox_inches="tight")
         plt.close()
 
-    return {"observed_diff": obs_diff, "p_value": p_value, "figure": fig}
+    return {
+        "observed_diff": obs_diff,
+        "p_value": p_value,
+        "n_perm_used": n_used,
+        "mc_se": mc_se,
+        "exact": exact,
+        "figure": fig,
+    }
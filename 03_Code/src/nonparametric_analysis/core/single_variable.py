@@ -2,30 +2,66 @@
 
 from __future__ import annotations
 
+import hashlib
+import heapq
+from collections import OrderedDict
+from concurrent.futures import Executor
+
 import numpy as np
 import pandas as pd
+from scipy import fft as sp_fft
 from scipy import stats
 import matplotlib.pyplot as plt
 import pymannkendall as mk
 import ruptures as rpt
 
-from ..utils.stats import as_float_array
+from ..utils.stats import _count_inversions, _tie_terms, as_float_array
+from .resampling import _block_sizes, _collect_null, _stream_plan
 
 
 # --- 3. Single Feature Analysis ---
 
 
+def _shapiro(sample: np.ndarray, max_n: int, seed: int) -> tuple:
+    """Shapiro-Wilk on a subsample of at most ``max_n`` values.
+
+    The subsample is drawn from a fresh generator seeded with ``seed``, so it
+    depends only on the series itself.
+    """
+    if len(sample) > max_n:
+        rng = np.random.default_rng(seed)
+        sample = rng.choice(sample, size=max_n, replace=False)
+    return stats.shapiro(sample)
+
+
 def test_normality(
     data: pd.Series | list[float],
     name: str = "Feature",
     alpha: float = 0.05,
     save_path: str = None,
+    plot: bool = True,
+    shapiro_max_n: int = 5000,
+    seed: int = 0,
 ) -> dict:
-    """Shapiro-Wilk normality test with 3-panel plot."""
+    """Shapiro-Wilk normality test with 3-panel plot.
+
+    ``plot=False`` skips the figure (``"figure"`` is None); see
+    ``normality_batch`` for many columns or large samples. As there,
+    Shapiro-Wilk runs on a seeded subsample of at most ``shapiro_max_n``
+    values (fixed ``seed=0`` by default, so repeated calls agree), and both
+    give the same result for the same ``seed``.
+    """
     clean_data = as_float_array(data)
     clean_data = clean_data[~np.isnan(clean_data)]
 
-    stat, p_value = stats.shapiro(clean_data)
+    stat, p_value = _shapiro(clean_data, shapiro_max_n, seed)
+    if not plot:
+        return {
+            "statistic": stat,
+            "p_value": p_value,
+            "is_normal": p_value >= alpha,
+            "figure": None,
+        }
 
     fig, axes = plt.subplots(1, 3, figsize=(15, 4))
 
@@ -146,28 +182,557 @@ def runs_test_analysis(
     }
 
 
+def _to_padded_block(data) -> tuple[np.ndarray, np.ndarray, pd.Index]:
+    """Series-major block of many series with NaNs squeezed out.
+
+    ``data`` is a DataFrame (numeric columns only) or 2D array with one
+    series per column. Returns ``(block, lengths, labels)``: a
+    ``(n_series, n_obs)`` float array whose rows hold each series' valid
+    values first (order kept) and NaN padding after, the number of valid
+    values per series, and the series labels.
+    """
+    if isinstance(data, pd.DataFrame):
+        data = data.select_dtypes(include=[np.number])
+        labels = data.columns
+        values = data.to_numpy(dtype=float)
+    else:
+        values = np.asarray(data, dtype=float)
+        if values.ndim != 2:
+            raise ValueError("Input must be two-dimensional (one series per column).")
+        labels = pd.RangeIndex(values.shape[1])
+    block = np.ascontiguousarray(values.T)
+    missing = np.isnan(block)
+    order = np.argsort(missing, axis=1, kind="stable")
+    block = np.take_along_axis(block, order, axis=1)
+    return block, (~missing).sum(axis=1), labels
+
+
+def runs_test_batch(data) -> dict:
+    """
+    Runs test for randomness on many series at once (no figure).
+
+    ``data`` holds one series per column (numeric DataFrame columns or 2D
+    array); missing values are dropped per series as in
+    ``runs_test_analysis``. Runs are counted from ``np.diff`` of the
+    above/below-median indicators of all series together. Returns arrays
+    ``runs``, ``expected``, ``z``, ``p_value`` and ``n`` aligned with
+    ``series``.
+    """
+    block, lengths, labels = _to_padded_block(data)
+    valid = np.arange(block.shape[1]) < lengths[:, None]
+
+    # Median of each series from its sorted valid prefix (NaNs sort last)
+    ordered = np.sort(block, axis=1)
+    rows = np.arange(len(block))
+    last = max(block.shape[1] - 1, 0)
+    mid_lo = np.clip((lengths - 1) // 2, 0, last)
+    mid_hi = np.clip(lengths // 2, 0, last)
+    median = (
+        (ordered[rows, mid_lo] + ordered[rows, mid_hi]) / 2
+        if block.shape[1]
+        else np.full(len(block), np.nan)
+    )
+    binary = (block >= median[:, None]) & valid
+    changes = (np.diff(binary.astype(np.int8), axis=1) != 0) & valid[:, 1:]
+    runs = 1 + changes.sum(axis=1)
+
+    n = lengths.astype(float)
+    n1 = binary.sum(axis=1).astype(float)
+    n0 = n - n1
+    with np.errstate(divide="ignore", invalid="ignore"):
+        expected = 2 * n1 * n0 / n + 1
+        var = 2 * n1 * n0 * (2 * n1 * n0 - n) / (n**2 * (n - 1))
+        std = np.sqrt(np.where(n > 1, var, 0.0))
+        z = np.where(std > 0, (runs - expected) / std, 0.0)
+    z = np.where(n > 0, z, np.nan)
+    p_value = 2 * stats.norm.sf(np.abs(z))
+
+    return {
+        "series": labels,
+        "runs": runs,
+        "expected": expected,
+        "z": z,
+        "p_value": p_value,
+        "n": lengths,
+    }
+
+
+def _skew_kurtosis_z(
+    g1: np.ndarray, g2: np.ndarray, n: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """z-scores of ``scipy.stats.skewtest`` / ``kurtosistest`` from moments."""
+    y = g1 * np.sqrt((n + 1) * (n + 3) / (6 * (n - 2)))
+    beta2 = (
+        3
+        * (n**2 + 27 * n - 70)
+        * (n + 1)
+        * (n + 3)
+        / ((n - 2) * (n + 5) * (n + 7) * (n + 9))
+    )
+    w2 = -1 + np.sqrt(2 * (beta2 - 1))
+    delta = 1 / np.sqrt(0.5 * np.log(w2))
+    alpha = np.sqrt(2 / (w2 - 1))
+    y = np.where(y == 0, 1, y)
+    z_skew = delta * np.log(y / alpha + np.sqrt((y / alpha) ** 2 + 1))
+
+    mean_b2 = 3 * (n - 1) / (n + 1)
+    var_b2 = 24 * n * (n - 2) * (n - 3) / ((n + 1) ** 2 * (n + 3) * (n + 5))
+    x = (g2 + 3 - mean_b2) / np.sqrt(var_b2)
+    root_beta1 = (
+        6
+        * (n**2 - 5 * n + 2)
+        / ((n + 7) * (n + 9))
+        * np.sqrt(6 * (n + 3) * (n + 5) / (n * (n - 2) * (n - 3)))
+    )
+    a = 6 + 8 / root_beta1 * (2 / root_beta1 + np.sqrt(1 + 4 / root_beta1**2))
+    denom = 1 + x * np.sqrt(2 / (a - 4))
+    term2 = np.sign(denom) * np.cbrt((1 - 2 / a) / np.abs(denom))
+    z_kurt = (1 - 2 / (9 * a) - term2) / np.sqrt(2 / (9 * a))
+    return z_skew, z_kurt
+
+
+def _anderson_normal_pvalue(statistic: np.ndarray, n: np.ndarray) -> np.ndarray:
+    """D'Agostino & Stephens (1986) p-value of the normal A-D statistic."""
+    a = statistic * (1 + 0.75 / n + 2.25 / n**2)
+    return np.select(
+        [a >= 0.6, a > 0.34, a > 0.2],
+        [
+            np.exp(1.2937 - 5.709 * a + 0.0186 * a**2),
+            np.exp(0.9177 - 4.279 * a - 1.38 * a**2),
+            1 - np.exp(-8.318 + 42.796 * a - 59.938 * a**2),
+        ],
+        1 - np.exp(-13.436 + 101.14 * a - 223.73 * a**2),
+    )
+
+
+def normality_batch(
+    data, shapiro: bool = True, shapiro_max_n: int = 5000, seed: int = 0
+) -> dict:
+    """
+    Normality tests on many series at once (no figure).
+
+    ``data`` holds one series per column (numeric DataFrame columns or 2D
+    array); missing values are dropped per series. Anderson-Darling (with
+    the D'Agostino & Stephens p-value), Jarque-Bera and D'Agostino's K^2
+    come from moments of the padded block, vectorised over all series. With
+    ``shapiro``, Shapiro-Wilk runs per series on a subsample of at most
+    ``shapiro_max_n`` values (where its p-value is still accurate), drawn
+    with a generator seeded by ``seed`` for each series, so a column's
+    result does not depend on the other columns and matches
+    ``test_normality``. Statistics need n >= 8 (Shapiro n >= 3) and are NaN
+    otherwise. Returns arrays aligned with ``series``.
+    """
+    block, lengths, labels = _to_padded_block(data)
+    n = lengths.astype(float)
+    valid = np.arange(block.shape[1]) < lengths[:, None]
+    tested = lengths >= 8
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.where(valid, block, 0.0).sum(axis=1) / n
+        dev = np.where(valid, block - mean[:, None], 0.0)
+        m2, m3, m4 = ((dev**k).sum(axis=1) / n for k in (2, 3, 4))
+        skewness = m3 / m2**1.5
+        kurtosis = m4 / m2**2 - 3
+
+        jb = n / 6 * (skewness**2 + kurtosis**2 / 4)
+        z_skew, z_kurt = _skew_kurtosis_z(skewness, kurtosis, n)
+        k2 = z_skew**2 + z_kurt**2
+
+        # Anderson-Darling on standardised order statistics (NaNs sort last)
+        ordered = np.sort(block, axis=1)
+        w = (ordered - mean[:, None]) / np.sqrt(m2 * n / (n - 1))[:, None]
+        mirror = np.clip(lengths[:, None] - 1 - np.arange(block.shape[1]), 0, None)
+        log_sf = np.take_along_axis(stats.norm.logsf(w), mirror, axis=1)
+        weight = (2 * np.arange(1, block.shape[1] + 1) - 1) / n[:, None]
+        terms = np.where(valid, weight * (stats.norm.logcdf(w) + log_sf), 0.0)
+        ad = -n - terms.sum(axis=1)
+
+    result = {
+        "series": labels,
+        "n": lengths,
+        "skewness": np.where(tested, skewness, np.nan),
+        "kurtosis": np.where(tested, kurtosis, np.nan),
+        "ad_statistic": np.where(tested, ad, np.nan),
+        "ad_p_value": np.where(tested, _anderson_normal_pvalue(ad, n), np.nan),
+        "jb_statistic": np.where(tested, jb, np.nan),
+        "jb_p_value": np.where(tested, stats.chi2.sf(jb, 2), np.nan),
+        "dagostino_statistic": np.where(tested, k2, np.nan),
+        "dagostino_p_value": np.where(tested, stats.chi2.sf(k2, 2), np.nan),
+    }
+    if shapiro:
+        w_stat = np.full(len(block), np.nan)
+        w_p = np.full(len(block), np.nan)
+        for k, (row, m) in enumerate(zip(block, lengths)):
+            if m < 3:
+                continue
+            w_stat[k], w_p[k] = _shapiro(row[:m], shapiro_max_n, seed)
+        result["shapiro_statistic"] = w_stat
+        result["shapiro_p_value"] = w_p
+    return result
+
+
+def _mk_statistics(block: np.ndarray, lengths: np.ndarray) -> tuple[np.ndarray, ...]:
+    """Mann-Kendall ``S`` and tie-corrected ``Var(S)`` of every padded series.
+
+    ``S = N - T - 2D`` with ``N`` all pairs, ``T`` tied pairs and ``D`` the
+    strict inversions of the series' dense ranks (merge-sort count). NaN
+    padding ranks above every value and in increasing order, so it adds no
+    inversions and only singleton (tie-free) runs.
+    """
+    n_series, width = block.shape
+    if width < 2:
+        return np.zeros(n_series), np.zeros(n_series)
+    order = np.argsort(block, axis=1, kind="stable")
+    sorted_vals = np.take_along_axis(block, order, axis=1)
+    change = np.ones_like(sorted_vals, dtype=bool)
+    change[:, 1:] = sorted_vals[:, 1:] != sorted_vals[:, :-1]
+    dense = np.empty(block.shape, dtype=np.int64)
+    np.put_along_axis(dense, order, np.cumsum(change, axis=1) - 1, axis=1)
+
+    tied_pairs, _, tie_var = _tie_terms(change)
+    n = lengths.astype(np.int64)
+    s = n * (n - 1) // 2 - tied_pairs - 2 * _count_inversions(dense)
+    var_s = (n * (n - 1) * (2 * n + 5) - tie_var) / 18
+    return s.astype(float), var_s
+
+
+def _mk_decision(
+    s: np.ndarray, var_s: np.ndarray, n: np.ndarray, alpha: float
+) -> tuple[np.ndarray, ...]:
+    """Continuity-corrected z, Kendall tau, two-sided p and trend labels."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        z = np.where(s > 0, (s - 1) / np.sqrt(var_s), 0.0)
+        z = np.where(s < 0, (s + 1) / np.sqrt(var_s), z)
+        tau = s / (0.5 * n * (n - 1))
+    p_value = 2 * (1 - stats.norm.cdf(np.abs(z)))
+    significant = np.abs(z) > stats.norm.ppf(1 - alpha / 2)
+    trend = np.where(
+        significant & (z < 0),
+        "decreasing",
+        np.where(significant & (z > 0), "increasing", "no trend"),
+    )
+    return z, tau, p_value, trend
+
+
+# Series length up to which Sen's slope enumerates every pairwise slope
+_SEN_DIRECT_MAX_N = 1000
+
+
+def _dense_ranks(values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Dense ranks of a 1D array and the run-start flags of its sorted order."""
+    order = np.argsort(values, kind="stable")
+    sorted_vals = values[order]
+    change = np.ones(len(values), dtype=bool)
+    change[1:] = sorted_vals[1:] != sorted_vals[:-1]
+    dense = np.empty(len(values), dtype=np.int64)
+    dense[order] = np.cumsum(change) - 1
+    return dense, change
+
+
+def _inversion_pairs(seq: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Positions ``(p, q)``, ``p < q``, of every pair with ``seq[p] >= seq[q]``.
+
+    Bottom-up merge sort of the dense ranks ``seq``. At each merge the left
+    entries that are >= a right entry form a tail of the sorted left run, so
+    pairs are emitted with ``np.repeat`` in O(n log n + pairs).
+    """
+    n = len(seq)
+    if n < 2:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    size = 1 << int(n - 1).bit_length()
+    top = int(seq.max()) + 1 + size - n
+    keys = np.arange(top - size, top, dtype=np.int64)  # increasing padding last
+    keys[:n] = seq
+    pos = np.arange(size)
+    firsts, seconds = [], []
+    width = 1
+    while width < size:
+        run_keys = keys.reshape(-1, 2 * width)
+        run_pos = pos.reshape(-1, 2 * width)
+        n_runs = len(run_keys)
+        # Offsetting each run by (top + 1) makes all left runs one sorted array
+        offset = np.arange(n_runs)[:, None] * (top + 1)
+        left = (run_keys[:, :width] + offset).ravel()
+        start = np.searchsorted(left, (run_keys[:, width:] + offset).ravel())
+        start = start.reshape(n_runs, width) - np.arange(n_runs)[:, None] * width
+        count = (width - start).ravel()
+        hit = count > 0
+        if hit.any():
+            count = count[hit]
+            first = (start + np.arange(n_runs)[:, None] * 2 * width).ravel()[hit]
+            step = np.arange(count.sum()) - np.repeat(np.cumsum(count) - count, count)
+            firsts.append(run_pos.ravel()[np.repeat(first, count) + step])
+            seconds.append(np.repeat(run_pos[:, width:].ravel()[hit], count))
+        order = np.argsort(run_keys, axis=1, kind="stable")
+        keys = np.take_along_axis(run_keys, order, axis=1).ravel()
+        pos = np.take_along_axis(run_pos, order, axis=1).ravel()
+        width *= 2
+    if not firsts:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    return np.concatenate(firsts), np.concatenate(seconds)
+
+
+def _slopes_at_most(x: np.ndarray, s: float) -> int:
+    """Number of pairwise slopes ``(x[j] - x[i]) / (j - i)`` that are <= ``s``.
+
+    For ``i < j`` the slope is <= ``s`` exactly when ``z[j] <= z[i]`` with
+    ``z = x - s * t``, i.e. the non-strict inversions of ``z``.
+    """
+    dense, change = _dense_ranks(x - s * np.arange(len(x)))
+    return int(_count_inversions(dense)[0] + _tie_terms(change[None])[0, 0])
+
+
+def _bracket_order(x: np.ndarray, lo: float, hi: float) -> tuple[np.ndarray, ...]:
+    """Order of ``x - lo * t`` (ties by ``x - hi * t``) and ``x - hi * t`` in it.
+
+    A pair is inverted in the returned values exactly when its slope lies
+    in ``(lo, hi]``.
+    """
+    t = np.arange(len(x))
+    z_hi = x - hi * t
+    order = np.lexsort((z_hi, x - lo * t))
+    return order, z_hi[order]
+
+
+def _slopes_between(x: np.ndarray, lo: float, hi: float) -> np.ndarray:
+    """All pairwise slopes in ``(lo, hi]``."""
+    order, z_hi = _bracket_order(x, lo, hi)
+    p, q = _inversion_pairs(_dense_ranks(z_hi)[0])
+    a, b = order[p], order[q]
+    return (x[b] - x[a]) / (b - a)
+
+
+def _slope_at_rank(
+    x: np.ndarray, rank: int, approx_tol: float, rng: np.random.Generator
+) -> float:
+    """Pairwise slope of 0-based ``rank`` without materialising all slopes.
+
+    Keeps a bracket ``(lo, hi]`` with ``#{slopes <= lo} <= rank <
+    #{slopes <= hi}``, seeded from a sample of random pairs and narrowed by
+    count-guided interpolation until it holds at most ``n`` slopes, which
+    are then enumerated. A bracket narrower than 1e-12 of the data range
+    holds slopes equal up to rounding, so one of them is returned.
+    """
+    n = len(x)
+    span = float(x.max() - x.min())
+    lo, c_lo = -span - 1.0, 0
+    hi, c_hi = span + 1.0, n * (n - 1) // 2
+
+    def narrow(s: float) -> None:
+        nonlocal lo, c_lo, hi, c_hi
+        c = _slopes_at_most(x, s)
+        if c <= rank:
+            lo, c_lo = s, c
+        else:
+            hi, c_hi = s, c
+
+    i, j = rng.integers(0, n, size=(2, 4 * n))
+    keep = i != j
+    sample = np.sort((x[j[keep]] - x[i[keep]]) / (j[keep] - i[keep]))
+    q = (rank + 0.5) / c_hi
+    half = 3 * np.sqrt(q * (1 - q) / len(sample)) + 1 / len(sample)
+    for quantile in (q - half, q + half):
+        if 0 <= quantile < 1:
+            s = sample[int(quantile * len(sample))]
+            if lo < s < hi:
+                narrow(s)
+
+    budget = max(n, 1024)
+    while c_hi - c_lo > budget:
+        if approx_tol is not None and hi - lo <= approx_tol:
+            return (lo + hi) / 2
+        frac = min(max((rank + 0.5 - c_lo) / (c_hi - c_lo), 0.05), 0.95)
+        mid = lo + frac * (hi - lo)
+        if hi - lo <= 1e-12 * max(span, 1.0) or not lo < mid < hi:
+            order, z_hi = _bracket_order(x, lo, hi)
+            adjacent = np.flatnonzero(z_hi[:-1] >= z_hi[1:])
+            if not len(adjacent):
+                return (lo + hi) / 2
+            a, b = order[adjacent], order[adjacent + 1]
+            return float(np.median((x[b] - x[a]) / (b - a)))
+        narrow(mid)
+    slopes = _slopes_between(x, lo, hi)
+    k = min(max(rank - c_lo, 0), len(slopes) - 1)
+    return float(np.partition(slopes, k)[k])
+
+
+def sens_slope(
+    data: pd.Series | list[float], alpha: float = None, approx_tol: float = None
+) -> dict:
+    """
+    Theil-Sen (Sen's) slope: the median of all pairwise slopes.
+
+    Missing values are dropped and the rest taken as equally spaced, as in
+    ``mann_kendall_test``. Long series never build the n(n-1)/2 slopes: the
+    number of slopes <= s is the inversion count of ``x - s*t``, so the
+    median is bracketed by merge-sort counts (O(n log n) time and O(n)
+    memory per step) and the last few slopes in the bracket are enumerated.
+    ``approx_tol`` stops as soon as the bracket is narrower than it; every
+    returned value is then within ``approx_tol / 2`` of the exact one.
+    ``alpha`` adds the rank-based ``1 - alpha`` confidence interval (Gilbert
+    1987) from the tie-corrected Mann-Kendall variance. Returns ``slope``,
+    ``intercept``, ``ci_lower``, ``ci_upper`` (NaN unless requested) and ``n``.
+    """
+    x = as_float_array(data)
+    x = x[~np.isnan(x)]
+    n = len(x)
+    n_pairs = n * (n - 1) // 2
+    ranks = [(n_pairs - 1) // 2, n_pairs // 2]
+    if alpha is not None and n_pairs:
+        _, var_s = _mk_statistics(x[None, :], np.array([n]))
+        c_alpha = stats.norm.ppf(1 - alpha / 2) * np.sqrt(var_s[0])
+        ranks += [
+            int(np.clip(np.round((n_pairs - c_alpha) / 2), 1, n_pairs)) - 1,
+            int(np.clip(np.round((n_pairs + c_alpha) / 2 + 1), 1, n_pairs)) - 1,
+        ]
+
+    if n_pairs == 0:
+        values = [np.nan] * len(ranks)
+    elif n <= _SEN_DIRECT_MAX_N:
+        i, j = np.triu_indices(n, 1)
+        slopes = np.sort((x[j] - x[i]) / (j - i))
+        values = [float(slopes[r]) for r in ranks]
+    else:
+        rng = np.random.default_rng(0)
+        found = {}
+        for r in ranks:
+            if r not in found:
+                found[r] = float(_slope_at_rank(x, r, approx_tol, rng))
+        values = [found[r] for r in ranks]
+
+    slope = (values[0] + values[1]) / 2
+    intercept = float(np.median(x) - (n - 1) / 2 * slope) if n else np.nan
+    ci_lower, ci_upper = values[2:] if alpha is not None else (np.nan, np.nan)
+    return {
+        "slope": slope,
+        "intercept": intercept,
+        "ci_lower": ci_lower,
+        "ci_upper": ci_upper,
+        "n": n,
+    }
+
+
+# Autocorrelation corrections of Var(S) for mann_kendall_test / _batch
+_MK_CORRECTIONS = ("hamed_rao", "yue_wang")
+
+
+def _fft_acf(block: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    """Autocorrelation of every NaN-padded row by FFT, O(n log n) per row.
+
+    Matches the biased estimator of ``pymannkendall`` (autocovariance
+    divided by n); lags at or beyond a row's length are 0.
+    """
+    valid = np.arange(block.shape[1]) < lengths[:, None]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.where(valid, block, 0.0).sum(axis=1) / lengths
+        centered = np.where(valid, block - mean[:, None], 0.0)
+    n_fft = sp_fft.next_fast_len(2 * block.shape[1] - 1, real=True)
+    spectrum = sp_fft.rfft(centered, n_fft, axis=1)
+    acov = sp_fft.irfft(spectrum * spectrum.conj(), n_fft, axis=1)
+    acov = acov[:, : block.shape[1]]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return acov / acov[:, :1]
+
+
+def _mk_variance_factor(
+    block: np.ndarray,
+    lengths: np.ndarray,
+    correction: str,
+    lag: int = None,
+    alpha: float = 0.05,
+) -> np.ndarray:
+    """Hamed-Rao (1998) or Yue-Wang (2004) inflation factor of Var(S) per row.
+
+    Each series is detrended with its Sen's slope; the ACF of the ranks
+    (Hamed-Rao, significant lags only) or of the values (Yue-Wang) up to
+    ``lag`` (default all) comes from ``_fft_acf``.
+    """
+    if correction not in _MK_CORRECTIONS:
+        raise ValueError(f"correction must be one of {_MK_CORRECTIONS}.")
+    width = block.shape[1]
+    t = np.arange(1, width + 1)
+    slopes = np.array(
+        [
+            sens_slope(row[:m])["slope"] if m > 1 else 0.0
+            for row, m in zip(block, lengths)
+        ]
+    )
+    detrended = block - t * slopes[:, None]
+    if correction == "hamed_rao" and width:
+        detrended = stats.rankdata(detrended, axis=1, nan_policy="omit")
+    acf = _fft_acf(detrended, lengths)[:, 1:]
+
+    n = lengths.astype(float)[:, None]
+    i = t[None, :-1]
+    max_lag = n if lag is None else np.minimum(n, lag + 1)
+    used = i < max_lag
+    if correction == "yue_wang":
+        return 1 + 2 * np.sum(np.where(used, (1 - i / n) * acf, 0.0), axis=1)
+    bound = stats.norm.ppf(1 - alpha / 2) / np.sqrt(n)
+    used &= np.abs(acf) > bound
+    weight = (n - i) * (n - i - 1) * (n - i - 2)
+    sni = np.sum(np.where(used, weight * acf, 0.0), axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return 1 + 2 * sni / (n[:, 0] * (n[:, 0] - 1) * (n[:, 0] - 2))
+
+
 def mann_kendall_test(
-    data: pd.Series | list[float], name: str = "Feature", save_path: str = None
+    data: pd.Series | list[float],
+    name: str = "Feature",
+    save_path: str = None,
+    engine: str = "native",
+    alpha: float = 0.05,
+    correction: str = None,
+    lag: int = None,
 ) -> dict:
-    """Mann-Kendall trend test with Sen's slope."""
+    """Mann-Kendall trend test with Sen's slope.
+
+    ``engine="native"`` computes S from a merge-sort inversion count, the
+    tie-corrected variance from value counts and Sen's slope with
+    ``sens_slope`` (all O(n log n));
+    ``"pymannkendall"`` delegates to ``pymannkendall.original_test``.
+
+    ``correction="hamed_rao"`` or ``"yue_wang"`` inflates Var(S) for
+    autocorrelation (ACF by FFT up to ``lag``), like pymannkendall's
+    modified tests.
+    """
     clean_data = as_float_array(data)
     clean_data = clean_data[~np.isnan(clean_data)]
 
-    result = mk.original_test(clean_data)
+    if engine == "native":
+        lengths = np.array([len(clean_data)])
+        s, var_s = _mk_statistics(clean_data[None, :], lengths)
+        if correction is not None:
+            var_s = var_s * _mk_variance_factor(
+                clean_data[None, :], lengths, correction, lag, alpha
+            )
+        _, tau, p_value, trend = _mk_decision(s, var_s, len(clean_data), alpha)
+        tau, p_value, trend = tau[0], p_value[0], str(trend[0])
+        sen = sens_slope(clean_data)
+        slope, intercept = sen["slope"], sen["intercept"]
+    elif engine == "pymannkendall":
+        if correction is None:
+            result = mk.original_test(clean_data, alpha=alpha)
+        elif correction in _MK_CORRECTIONS:
+            test = getattr(mk, f"{correction}_modification_test")
+            result = test(clean_data, alpha=alpha, lag=lag)
+        else:
+            raise ValueError(f"correction must be one of {_MK_CORRECTIONS}.")
+        tau, p_value, trend = result.Tau, result.p, result.trend
+        slope, intercept = result.slope, result.intercept
+    else:
+        raise ValueError("engine must be 'native' or 'pymannkendall'.")
 
     fig, ax = plt.subplots(figsize=(10, 5))
     ax.plot(clean_data, "b-o", markersize=4, alpha=0.7)
     x_line = np.arange(len(clean_data))
     ax.plot(
         x_line,
-        result.intercept + result.slope * x_line,
+        intercept + slope * x_line,
         "r-",
         lw=2,
-        label=f"Sen's slope={result.slope:.3f}",
-    )
-    ax.set_title(
-        f"{name}: Mann-Kendall (tau={result.Tau:.3f}, p={result.p:.4f}, {result.trend})"
+        label=f"Sen's slope={slope:.3f}",
     )
+    ax.set_title(f"{name}: Mann-Kendall (tau={tau:.3f}, p={p_value:.4f}, {trend})")
     ax.legend()
     plt.tight_layout()
 
@@ -176,18 +741,170 @@ def mann_kendall_test(
         plt.close()
 
     return {
-        "tau": result.Tau,
-        "p_value": result.p,
-        "slope": result.slope,
-        "trend": result.trend,
+        "tau": tau,
+        "p_value": p_value,
+        "slope": slope,
+        "trend": trend,
         "figure": fig,
     }
 
 
+def mann_kendall_batch(
+    data, alpha: float = 0.05, correction: str = None, lag: int = None
+) -> dict:
+    """
+    Mann-Kendall trend test on many series at once (no figure).
+
+    ``data`` holds one series per column (numeric DataFrame columns or 2D
+    array); missing values are dropped per series. ``correction`` / ``lag``
+    apply the autocorrelation corrections of ``mann_kendall_test`` with one
+    batched FFT. Returns arrays ``s``, ``var_s``, ``z``, ``tau``,
+    ``p_value``, ``trend`` and ``n`` aligned with ``series``.
+    """
+    block, lengths, labels = _to_padded_block(data)
+    s, var_s = _mk_statistics(block, lengths)
+    if correction is not None:
+        var_s = var_s * _mk_variance_factor(block, lengths, correction, lag, alpha)
+    z, tau, p_value, trend = _mk_decision(s, var_s, lengths, alpha)
+    return {
+        "series": labels,
+        "s": s,
+        "var_s": var_s,
+        "z": z,
+        "tau": tau,
+        "p_value": p_value,
+        "trend": trend,
+        "n": lengths,
+    }
+
+
+def mann_kendall_panel(
+    df: pd.DataFrame,
+    entity: str = "entity_id",
+    time: str = "time_index",
+    features: list[str] = None,
+    period: int = None,
+    alpha: float = 0.05,
+) -> pd.DataFrame:
+    """
+    Mann-Kendall trends for every entity-feature pair of a long panel.
+
+    Rows are sorted once by ``(entity, time)``, so each entity is a
+    contiguous index range that is scattered into a padded block per
+    feature and tested in one batch (see ``mann_kendall_batch``). With
+    ``period``, the seasonal test (Hirsch & Slack 1984, as
+    ``pymannkendall.seasonal_test``) adds S and Var(S) over the sub-series
+    of each season. ``time`` must then hold integer periods (unique per
+    entity): season ``j`` holds the times ``t0 + j, t0 + j + period, ...``
+    with ``t0`` the panel's first time, so a missing period leaves a gap
+    instead of shifting later seasons. Returns a tidy table with one row per
+    entity (column named after ``entity``), ``feature`` and ``test``
+    (``"original"`` / ``"seasonal"``).
+    """
+    if features is None:
+        features = [
+            c for c in df.select_dtypes("number").columns if c not in (entity, time)
+        ]
+    panel = df.sort_values([entity, time], kind="stable")
+    codes, entities = pd.factorize(panel[entity], sort=False)
+    starts = np.flatnonzero(np.diff(codes, prepend=-1))
+    position = np.arange(len(panel)) - starts[codes]
+    width = int(position.max()) + 1 if len(panel) else 0
+    if period and len(panel):
+        times = panel[time].to_numpy(dtype=float)
+        if not np.array_equal(times, np.round(times)):
+            raise ValueError("Seasonal test needs integer periods in the time column.")
+        if panel.duplicated([entity, time]).any():
+            raise ValueError("Seasonal test needs one row per entity and time.")
+        grid = (times - times.min()).astype(np.int64)
+        n_cycles = -(-(int(grid.max()) + 1) // period)
+
+    tables = []
+    for feature in features:
+        wide = np.full((width, len(entities)), np.nan)
+        wide[position, codes] = panel[feature].to_numpy(dtype=float)
+        tests = [("original", wide)]
+        if period and len(panel):
+            # Season j of an entity holds its times t0 + j, t0 + j + period, ...
+            seasonal = np.full((n_cycles * period, len(entities)), np.nan)
+            seasonal[grid, codes] = panel[feature].to_numpy(dtype=float)
+            tests.append(("seasonal", seasonal.reshape(n_cycles, -1)))
+        for test, values in tests:
+            block, lengths, _ = _to_padded_block(values)
+            s, var_s = _mk_statistics(block, lengths)
+            n = lengths.astype(np.int64)
+            pairs = n * (n - 1) / 2
+            if test == "seasonal":
+                s, var_s, pairs, n = (
+                    v.reshape(period, len(entities)).sum(axis=0)
+                    for v in (s, var_s, pairs, n)
+                )
+            z, _, p_value, trend = _mk_decision(s, var_s, n, alpha)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                tau = s / pairs
+            tables.append(
+                pd.DataFrame(
+                    {
+                        entity: entities,
+                        "feature": feature,
+                        "test": test,
+                        "n": n,
+                        "s": s,
+                        "var_s": var_s,
+                        "z": z,
+                        "tau": tau,
+                        "p_value": p_value,
+                        "trend": trend,
+                    }
+                )
+            )
+    return pd.concat(tables, ignore_index=True) if tables else pd.DataFrame()
+
+
+def _pettitt_stream_worker(ranks: np.ndarray, chunk_size: int, streams: list) -> list:
+    """Permutation null of Pettitt's K for a group of seeded streams.
+
+    Each block of shuffled rank vectors gets all its ``U_t`` from one
+    ``cumsum`` along the rows.
+    """
+    n = len(ranks)
+    t = np.arange(1, n)
+    results = []
+    for seed_seq, size in streams:
+        rng = np.random.default_rng(seed_seq)
+        blocks = []
+        for rows in _block_sizes(size, n, chunk_size):
+            shuffled = rng.permuted(np.broadcast_to(ranks, (rows, n)), axis=1)
+            u = 2 * np.cumsum(shuffled[:, :-1], axis=1) - t * (n + 1)
+            blocks.append(np.abs(u).max(axis=1))
+        results.append(np.concatenate(blocks))
+    return results
+
+
 def pettitt_test(
-    data: pd.Series | list[float], name: str = "Feature", save_path: str = None
+    data: pd.Series | list[float],
+    name: str = "Feature",
+    save_path: str = None,
+    method: str = "asymptotic",
+    n_perm: int = 5000,
+    seed: int = None,
+    sequential: bool = False,
+    alpha: float = 0.05,
+    chunk_size: int = None,
+    n_jobs: int = 1,
+    executor: Executor = None,
 ) -> dict:
-    """Pettitt change-point test (Optimized O(N log N))."""
+    """Pettitt change-point test (Optimized O(N log N)).
+
+    ``method="permutation"`` replaces the conservative asymptotic p-value
+    with a Monte Carlo one from ``n_perm`` shuffles of the ranks, drawn in
+    blocks of ``chunk_size`` on seeded streams (``n_jobs`` / ``executor`` as
+    in ``permutation_test``). ``sequential=True`` stops once the p-value is
+    settled against ``alpha``; ``n_perm_used`` and ``mc_se`` are added to the
+    result.
+    """
+    if method not in ("asymptotic", "permutation"):
+        raise ValueError("method must be 'asymptotic' or 'permutation'.")
     clean_data = as_float_array(data)
     clean_data = clean_data[~np.isnan(clean_data)]
     n = len(clean_data)
@@ -214,6 +931,22 @@ def pettitt_test(
     # If cp=0, split is after index 0. (0 vs 1..n-1)
 
     p_value = 2 * np.exp(-6 * K**2 / (n**3 + n**2))
+    extra = {}
+    if method == "permutation":
+        # Ranks sum to integers or half-integers, so ties with K are exact
+        _, n_exceed, n_used = _collect_null(
+            _pettitt_stream_worker,
+            (ranks, chunk_size),
+            _stream_plan(seed, n_perm),
+            lambda block: block >= K,
+            sequential,
+            alpha,
+            n_jobs,
+            executor,
+        )
+        p_value = n_exceed / n_used if n_used else np.nan
+        mc_se = np.sqrt(p_value * (1 - p_value) / n_used) if n_used else np.nan
+        extra = {"n_perm_used": n_used, "mc_se": mc_se}
 
     # Split: data[:cp+1] vs data[cp+1:]
     # Guide code used [:cp] vs [cp:], implying cp is start of second segment.
@@ -267,30 +1000,380 @@ def pettitt_test(
         "p_value": float(p_value),
         "median_before": float(med_before),
         "median_after": float(med_after),
+        **extra,
         "figure": fig,
     }
 
 
+def _entity_columns(
+    df: pd.DataFrame, by: str, time: str = None, value_columns: list[str] = None
+) -> pd.DataFrame:
+    """One column per (value column, entity) of a long DataFrame.
+
+    ``value_columns`` defaults to the numeric columns other than ``by`` and
+    ``time``. Rows follow ``time`` within each entity (file order when
+    None); entities of different lengths are padded with NaN at the end.
+    """
+    if value_columns is None:
+        value_columns = [
+            c for c in df.select_dtypes("number").columns if c not in (by, time)
+        ]
+    if time is not None:
+        df = df.sort_values(time, kind="stable")
+    position = df.groupby(by, sort=False).cumcount()
+    values = df[list(value_columns)].set_index([df[by], position])
+    return values.unstack(by)
+
+
+def pettitt_batch(
+    data, by: str = None, time: str = None, value_columns: list[str] = None
+) -> dict:
+    """
+    Pettitt change-point test on many series at once (no figure).
+
+    ``data`` holds one series per column (numeric DataFrame columns or 2D
+    array); missing values are dropped per series. With ``by``, ``data`` is
+    a long DataFrame and every value column (``value_columns``, default: the
+    numeric columns other than ``by`` and ``time``) is tested per entity in
+    ``time`` order (series labelled ``(column, entity)``). The block is
+    ranked once (row-wise, NaN padding omitted) and ``argmax |U_t|`` is
+    taken for all series together. Returns arrays ``change_point`` (start of
+    the new segment, as in ``pettitt_test``; -1 when a series has fewer than
+    two values), ``statistic``, ``p_value``, ``median_before``,
+    ``median_after`` and ``n`` aligned with ``series``.
+    """
+    if by is not None:
+        data = _entity_columns(data, by, time, value_columns)
+    block, lengths, labels = _to_padded_block(data)
+    n_series, width = block.shape
+    n = lengths.astype(float)
+    ranks = stats.rankdata(block, axis=1, nan_policy="omit") if width else block
+    t = np.arange(1, width + 1)
+    u = np.abs(2 * np.nancumsum(ranks, axis=1) - t * (n[:, None] + 1))
+    # Split after position t - 1 leaves both segments non-empty for t < n
+    u = np.where(t < lengths[:, None], u, -1.0)
+
+    tested = lengths >= 2
+    split = u.argmax(axis=1) if width else np.zeros(n_series, dtype=np.int64)
+    statistic = np.where(tested, u[np.arange(n_series), split] if width else 0, 0.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        p_value = np.where(tested, 2 * np.exp(-6 * statistic**2 / (n**3 + n**2)), 1.0)
+    change_point = np.where(tested, split + 1, -1)
+
+    median_before = np.full(n_series, np.nan)
+    median_after = np.full(n_series, np.nan)
+    if tested.any():
+        position = np.arange(width)
+        rows = block[tested]
+        before = position < change_point[tested, None]
+        median_before[tested] = np.nanmedian(np.where(before, rows, np.nan), axis=1)
+        median_after[tested] = np.nanmedian(np.where(before, np.nan, rows), axis=1)
+
+    return {
+        "series": labels,
+        "change_point": change_point,
+        "statistic": statistic,
+        "p_value": p_value,
+        "median_before": median_before,
+        "median_after": median_after,
+        "n": lengths,
+    }
+
+
+def _pettitt_interval(
+    x: np.ndarray, order: np.ndarray, start: int, min_size: int
+) -> tuple[float, int, float]:
+    """Pettitt ``(log_p, change_point, K)`` of ``x[start:start + len(order)]``.
+
+    ``order`` is the interval's stable value order, taken from its parent, so
+    average ranks follow from tie runs in O(m) without sorting again. Only
+    splits leaving ``min_size`` points on both sides are considered. The
+    asymptotic p-value is returned as its log, which does not underflow on
+    long series, so strong splits stay comparable.
+    """
+    m = len(order)
+    values = x[order]
+    change = np.ones(m, dtype=bool)
+    change[1:] = values[1:] != values[:-1]
+    starts = np.flatnonzero(change)
+    ends = np.append(starts[1:], m)
+    ranks = np.empty(m)
+    ranks[order - start] = ((starts + ends + 1) / 2)[np.cumsum(change) - 1]
+    t = np.arange(min_size, m - min_size + 1)
+    u = np.abs(2 * np.cumsum(ranks)[t - 1] - t * (m + 1))
+    k = int(np.argmax(u))
+    K = float(u[k])
+    return np.log(2) - 6 * K**2 / (m**3 + m**2), start + int(t[k]), K
+
+
+def pettitt_segmentation(
+    data: pd.Series | list[float],
+    alpha: float = 0.05,
+    min_size: int = 2,
+    max_changepoints: int = None,
+    n_intervals: int = None,
+    seed: int = None,
+) -> dict:
+    """
+    Multiple change points by binary segmentation with the Pettitt statistic.
+
+    Compute-only, for series too long for ``pettitt_test`` or
+    ``detect_changepoints_pelt``. The series is sorted once; a child
+    interval takes its value order by filtering its parent's, so every
+    level of splits costs O(n) and the search is about O(n log n). Splits
+    are accepted most significant first (by log p-value, so p-values that
+    underflow to 0 are still ranked) while the asymptotic Pettitt p-value
+    is below ``alpha`` (up to ``max_changepoints``).
+
+    ``n_intervals`` switches to wild binary segmentation: that many random
+    sub-intervals are scored once up front, and each interval is split at
+    the most significant candidate among itself and the random intervals
+    it contains.
+
+    Returns ``changepoints`` (sorted start indices of new segments),
+    ``details`` (DataFrame with ``change_point``, ``statistic``, ``p_value``
+    and the tested interval ``start``/``end``) and ``n_segments``.
+    """
+    x = as_float_array(data)
+    x = x[~np.isnan(x)]
+    n = len(x)
+    min_size = max(int(min_size), 1)
+    order = np.argsort(x, kind="stable")
+
+    wild = []
+    if n_intervals and n >= 2 * min_size:
+        rng = np.random.default_rng(seed)
+        bounds = np.sort(rng.integers(0, n + 1, size=(n_intervals, 2)), axis=1)
+        for a, b in bounds[bounds[:, 1] - bounds[:, 0] >= 2 * min_size]:
+            inside = order[(order >= a) & (order < b)]
+            wild.append((a, b, *_pettitt_interval(x, inside, a, min_size)))
+
+    def best_split(part: np.ndarray, start: int, end: int) -> tuple | None:
+        if end - start < 2 * min_size:
+            return None
+        log_p, split, K = _pettitt_interval(x, part, start, min_size)
+        for a, b, log_p_wild, split_wild, K_wild in wild:
+            if start <= a and b <= end and log_p_wild < log_p:
+                log_p, split, K = log_p_wild, split_wild, K_wild
+        return (log_p, start, end, split, K) if log_p < np.log(alpha) else None
+
+    pending = []
+    found = best_split(order, 0, n)
+    if found:
+        heapq.heappush(pending, (*found, order))
+    rows = []
+    while pending and (max_changepoints is None or len(rows) < max_changepoints):
+        log_p, start, end, split, K, part = heapq.heappop(pending)
+        rows.append((split, K, min(np.exp(log_p), 1.0), start, end))
+        for child, lo, hi in (
+            (part[part < split], start, split),
+            (part[part >= split], split, end),
+        ):
+            found = best_split(child, lo, hi)
+            if found:
+                heapq.heappush(pending, (*found, child))
+
+    details = pd.DataFrame(
+        sorted(rows), columns=["change_point", "statistic", "p_value", "start", "end"]
+    )
+    return {
+        "changepoints": details["change_point"].astype(int).tolist(),
+        "details": details,
+        "n_segments": len(details) + 1,
+    }
+
+
+# Models whose segment costs the native PELT engine derives from prefix sums
+_PELT_NATIVE_MODELS = ("l2", "normal", "rank")
+
+
+def _segment_cost(x: np.ndarray, model: str):
+    """Vectorised ``cost(starts, end)`` of the segments ``x[starts:end]``.
+
+    Prefix sums make every segment O(1): ``"l2"`` is the within-segment sum
+    of squares, ``"normal"`` the Gaussian mean-variance cost
+    ``len * log(var + 1e-6)`` (ruptures' ``CostNormal`` with its small
+    diagonal bias) and ``"rank"`` the sum of squares of the ranks scaled by
+    their population variance (ddof 0, as ``np.cov(bias=True)`` in
+    ruptures' ``CostRank``; the two differ by the constant ``n``).
+    """
+    if model == "rank":
+        x = stats.rankdata(x)
+    x = x - x.mean()
+    s1 = np.concatenate([[0.0], np.cumsum(x)])
+    s2 = np.concatenate([[0.0], np.cumsum(x * x)])
+    spread = np.var(x, ddof=0)
+
+    def cost(starts: np.ndarray, end: int) -> np.ndarray:
+        length = end - starts
+        total = s1[end] - s1[starts]
+        squares = np.maximum(s2[end] - s2[starts] - total**2 / length, 0.0)
+        if model == "l2":
+            return squares
+        if model == "rank":
+            return squares / spread if spread > 0 else squares
+        return length * np.log(squares / length + 1e-6)
+
+    return cost
+
+
+def _pelt(
+    cost, n: int, penalty: float, min_size: int, jump: int = 1
+) -> tuple[list[int], float]:
+    """Optimal segmentation by PELT; returns breakpoints (ending at n) and cost.
+
+    Breakpoints lie on multiples of ``jump`` (plus ``n``), on the same grid
+    as ruptures' ``Pelt``. Candidates whose best cost exceeds the optimum by
+    more than ``penalty`` are pruned, as in ruptures, and each step scores
+    all remaining candidates in one vectorised call.
+    """
+    best = np.full(n + 1, np.inf)
+    best[0] = -penalty
+    previous = np.zeros(n + 1, dtype=np.int64)
+    candidates = np.zeros(0, dtype=np.int64)
+    ends = [end for end in range(0, n, jump) if end >= min_size] + [n]
+    for end in ends:
+        # Newest start keeps the last segment at least min_size long
+        start = (end - min_size) // jump * jump
+        if start >= 0 and np.isfinite(best[start]) and start not in candidates[-1:]:
+            candidates = np.append(candidates, start)
+        if len(candidates) == 0:
+            continue
+        scores = best[candidates] + cost(candidates, end) + penalty
+        k = np.argmin(scores)
+        best[end], previous[end] = scores[k], candidates[k]
+        candidates = candidates[scores <= best[end] + penalty]
+    breakpoints = [n]
+    while previous[breakpoints[-1]] > 0:
+        breakpoints.append(int(previous[breakpoints[-1]]))
+    breakpoints.reverse()
+    return breakpoints, float(best[n] - penalty * (len(breakpoints) - 1))
+
+
+# CROPS paths keyed by a digest of the series, so cached entries never hold it
+_PELT_PATHS: OrderedDict = OrderedDict()
+_PELT_PATHS_MAXSIZE = 8
+
+
+def _pelt_path(
+    x: np.ndarray, model: str, min_size: int, jump: int, pen_min: float, pen_max: float
+) -> tuple[tuple, ...]:
+    """Optimal segmentations for every penalty in ``[pen_min, pen_max]`` (CROPS).
+
+    Haynes, Eckley & Fearnhead (2017): PELT is only rerun at the penalty
+    where two known segmentations cost the same. Returns ``(n_changepoints,
+    cost, breakpoints)`` by decreasing ``n_changepoints``; cached per series
+    (blake2b digest and length), model and range so other penalties need no
+    refit.
+    """
+    x = np.ascontiguousarray(x, dtype=float)
+    key = (
+        hashlib.blake2b(x, digest_size=16).digest(),
+        len(x),
+        model,
+        min_size,
+        jump,
+        pen_min,
+        pen_max,
+    )
+    if key in _PELT_PATHS:
+        _PELT_PATHS.move_to_end(key)
+        return _PELT_PATHS[key]
+    cost = _segment_cost(x, model)
+    fits = {}
+
+    def fit(penalty: float) -> tuple[float, int, float]:
+        breakpoints, total = _pelt(cost, len(x), penalty, min_size, jump)
+        fits.setdefault(len(breakpoints) - 1, (total, tuple(breakpoints)))
+        return penalty, len(breakpoints) - 1, total
+
+    pending = [(fit(pen_min), fit(pen_max))]
+    while pending:
+        low, high = pending.pop()
+        if low[1] <= high[1] + 1:
+            continue
+        middle = fit((high[2] - low[2]) / (low[1] - high[1]))
+        if middle[1] not in (low[1], high[1]):
+            pending += [(low, middle), (middle, high)]
+    path = tuple((m, *fits[m]) for m in sorted(fits, reverse=True))
+    _PELT_PATHS[key] = path
+    if len(_PELT_PATHS) > _PELT_PATHS_MAXSIZE:
+        _PELT_PATHS.popitem(last=False)
+    return path
+
+
+def _default_penalty(clean_data: np.ndarray) -> float:
+    """Default penalty ``log(n) * var(x)`` for every model and engine."""
+    var = np.var(clean_data)
+    return np.log(len(clean_data)) * var if var > 0 else 1.0
+
+
 def detect_changepoints_pelt(
     data: pd.Series | list[float],
     model: str = "rbf",
     penalty: float = None,
     name: str = "Feature",
     save_path: str = None,
+    engine: str = "auto",
+    min_size: int = 2,
+    penalty_range: tuple[float, float] = None,
+    jump: int = 5,
 ) -> dict:
-    """PELT multiple change-point detection."""
+    """PELT multiple change-point detection.
+
+    ``engine="native"`` (the ``"auto"`` choice for ``model`` ``"l2"``,
+    ``"normal"`` or ``"rank"``) runs an in-package PELT with O(1) prefix-sum
+    segment costs and O(n) memory; ``"ruptures"`` keeps ``rpt.Pelt``, whose
+    default ``"rbf"`` cost builds an n x n Gram matrix. Both engines use the
+    same costs, the default penalty ``log(n) * var(x)`` and breakpoints on
+    multiples of ``jump`` (ruptures' default 5; ``jump=1`` searches every
+    position), so they return the same change points.
+
+    ``penalty_range=(low, high)`` (native only) finds the optimal
+    segmentation for every penalty in the range with CROPS and caches it, so
+    other penalties in the range are answered without refitting. The path is
+    returned as ``penalty_path``.
+    """
     clean_data = as_float_array(data)
     clean_data = clean_data[~np.isnan(clean_data)]
 
-    signal = clean_data.reshape(-1, 1)
-    if penalty is None:
-        penalty = (
-            np.log(len(clean_data)) * np.var(clean_data)
-            if np.var(clean_data) > 0
-            else 1.0
-        )
+    if engine == "auto":
+        engine = "native" if model in _PELT_NATIVE_MODELS else "ruptures"
+    if engine not in ("native", "ruptures"):
+        raise ValueError("engine must be 'auto', 'native' or 'ruptures'.")
+    if engine == "native" and model not in _PELT_NATIVE_MODELS:
+        raise ValueError(f"Native PELT supports models {_PELT_NATIVE_MODELS}.")
+    if penalty_range is not None and engine != "native":
+        raise ValueError("penalty_range requires the native engine.")
 
-    result = rpt.Pelt(model=model, min_size=2).fit(signal).predict(pen=penalty)
+    extra = {}
+    if penalty_range is not None:
+        low, high = sorted(float(p) for p in penalty_range)
+        if penalty is None:
+            penalty = min(max(_default_penalty(clean_data), low), high)
+        if not low <= penalty <= high:
+            raise ValueError("penalty must lie inside penalty_range.")
+        path = _pelt_path(clean_data, model, min_size, jump, low, high)
+        choice = min(path, key=lambda fit: fit[1] + penalty * fit[0])
+        result = list(choice[2])
+        extra["penalty_path"] = pd.DataFrame(
+            [(m, total, list(bkps[:-1])) for m, total, bkps in path],
+            columns=["n_changepoints", "cost", "changepoints"],
+        )
+    elif engine == "native":
+        cost = _segment_cost(clean_data, model)
+        if penalty is None:
+            penalty = _default_penalty(clean_data)
+        result, _ = _pelt(cost, len(clean_data), penalty, min_size, jump)
+    else:
+        if penalty is None:
+            penalty = _default_penalty(clean_data)
+        signal = clean_data.reshape(-1, 1)
+        result = (
+            rpt.Pelt(model=model, min_size=min_size, jump=jump)
+            .fit(signal)
+            .predict(pen=penalty)
+        )
     # result includes end index (len(data))
 
     fig, axes = plt.subplots(2, 1, figsize=(12, 8))
@@ -313,7 +1396,8 @@ def detect_changepoints_pelt(
 
     axes[0].set_title(f"{name}: PELT ({len(result)-1} changes)")
     if segs:
-        axes[1].boxplot(segs, labels=labels, patch_artist=True)
+        axes[1].boxplot(segs, patch_artist=True)
+        axes[1].set_xticks(range(1, len(segs) + 1), labels)
     axes[1].set_title("Segment Distribution")
     plt.tight_layout()
 
@@ -324,5 +1408,6 @@ def detect_changepoints_pelt(
     return {
         "changepoints": [int(cp) for cp in result[:-1]],
         "n_segments": len(result),
+        **extra,
         "figure": fig,
     }
@@ -85,6 +85,73 @@ def as_float_array(values: np.ndarray | pd.Series | list[float]) -> np.ndarray:
     return array
 
 
+# Run length below which inversions are counted by direct comparison
+_INVERSION_BLOCK = 16
+
+
+def _count_inversions(seq: np.ndarray) -> np.ndarray:
+    """Strict inversions ``#{p < q: seq[p] > seq[q]}`` of every row of ``seq``.
+
+    Bottom-up merge sort over all rows at once. ``seq`` holds non-negative
+    integers (dense ranks). Blocks of ``_INVERSION_BLOCK`` entries are
+    counted by direct comparison and sorted once, which skips the small
+    merge levels where per-run sort overhead dominates. Above that,
+    right-run entries carry a tag bit, so after a merge the right entry at
+    local position ``pos`` that follows ``j`` other right entries has
+    ``w - (pos - j)`` larger left entries after it. Summed over a run this
+    leaves ``sum(pos)`` as the only data term.
+    """
+    seq = np.atleast_2d(seq)
+    n_rows, n = seq.shape
+    if n < 2:
+        return np.zeros(n_rows, dtype=np.int64)
+    size = 1 << int(n - 1).bit_length()
+    top = int(seq.max()) + 1
+    dtype = np.int32 if 2 * top + 1 < np.iinfo(np.int32).max else np.int64
+    keys = np.full((n_rows, size), top, dtype=dtype)  # padding sorts last
+    keys[:, :n] = seq
+    width = min(_INVERSION_BLOCK, size)
+    blocks = keys.reshape(n_rows, -1, width)
+    inversions = np.zeros(n_rows, dtype=np.int64)
+    for lag in range(1, width):
+        inversions += np.count_nonzero(
+            blocks[:, :, :-lag] > blocks[:, :, lag:], axis=(1, 2)
+        )
+    blocks.sort(axis=-1)
+    keys <<= 1
+    while width < size:
+        runs = keys.reshape(n_rows, -1, 2, width)
+        runs[:, :, 1, :] |= 1
+        runs = np.sort(runs.reshape(n_rows, -1, 2 * width), axis=-1)
+        # Per-run sums stay below 2 * width**2, which fits int32 up to 2**15
+        local = np.arange(2 * width, dtype=dtype if width <= 2**15 else np.int64)
+        right_pos = ((runs & 1).astype(local.dtype, copy=False) @ local).sum(
+            axis=1, dtype=np.int64
+        )
+        n_runs = runs.shape[1]
+        inversions += n_runs * (width * width + width * (width - 1) // 2) - right_pos
+        keys = runs.reshape(n_rows, size)
+        keys &= ~1
+        width *= 2
+    return inversions
+
+
+def _tie_terms(change: np.ndarray) -> np.ndarray:
+    """Per-row tie sums from run-start flags of sorted rows.
+
+    Returns scipy's ``kendalltau`` terms ``sum t(t-1)/2``, ``sum t(t-1)(t-2)``
+    and ``sum t(t-1)(2t+5)`` over tie runs of length ``t``, shape ``(3, rows)``.
+    """
+    n_rows, m = change.shape
+    starts = np.flatnonzero(change)
+    t = np.diff(np.append(starts, n_rows * m))
+    terms = np.stack(
+        [t * (t - 1) // 2, t * (t - 1) * (t - 2), t * (t - 1) * (2 * t + 5)]
+    )
+    first_run = np.searchsorted(starts, np.arange(n_rows) * m)
+    return np.add.reduceat(terms, first_run, axis=1)
+
+
 def benjamini_hochberg(p_values: np.ndarray | pd.Series | list[float]) -> np.ndarray:
     """Benjamini-Hochberg FDR-adjusted p-values."""
     p_array = np.asarray(p_values, dtype=float)
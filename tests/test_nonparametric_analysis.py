@@ -1,7 +1,13 @@
 """Nonparametric analysis module tests."""
 
+import os
+from concurrent.futures import Executor, Future
+
+import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
+import pytest
+from scipy import stats
 from pathlib import Path
 import sys
 
@@ -10,16 +16,45 @@ SRC_DIR = ROOT_DIR / "03_Code" / "src"
 if str(SRC_DIR) not in sys.path:
     sys.path.insert(0, str(SRC_DIR))
 
+from nonparametric_analysis.core import (
+    append_spearman,
+    bootstrap_blb,
+    bootstrap_ci_streaming,
+    correlation_matrix_blocked,
+    load_spearman_state,
+    mann_kendall_batch,
+    mann_kendall_panel,
+    normality_batch,
+    pettitt_batch,
+    pettitt_segmentation,
+    runs_test_analysis,
+    runs_test_batch,
+    save_spearman_state,
+    sens_slope,
+    top_correlated_pairs,
+)
 from nonparametric_analysis.analysis import (
     adjust_pvalue_matrix_fdr,
+    benjamini_hochberg,
+    bootstrap_ci,
     correlation_matrix_nonparametric,
+    detect_changepoints_pelt,
+    distance_correlation,
     formula_violation_mask,
     generate_sample_dataset,
     mann_kendall_test,
     pettitt_test,
+    permutation_test,
 )
 
 
+@pytest.fixture(autouse=True)
+def close_figures():
+    """Close figures created by the plotting APIs after each test."""
+    yield
+    plt.close("all")
+
+
 def test_pettitt_detects_change_point_near_true_location():
     rng = np.random.default_rng(7)
     left = rng.normal(loc=10.0, scale=1.0, size=45)
@@ -93,3 +128,661 @@ def test_sample_dataset_has_expected_columns():
     }
     assert set(df.columns) == expected_columns
     assert len(df) == 120
+
+
+def test_batch_tests_use_numeric_columns_of_mixed_frames():
+    df = generate_sample_dataset(n_rows=120, seed=42)
+    numeric = list(df.select_dtypes(include=[np.number]).columns)
+
+    for batch_test, key in (
+        (runs_test_batch, "p_value"),
+        (mann_kendall_batch, "p_value"),
+        (pettitt_batch, "p_value"),
+        (normality_batch, "jb_p_value"),
+    ):
+        result = batch_test(df)
+        assert list(result["series"]) == numeric
+        assert np.array_equal(result[key], batch_test(df[numeric])[key])
+
+
+def test_bootstrap_ci_block_engine_matches_scalar_fallback():
+    values = np.random.default_rng(11).normal(loc=5.0, scale=1.0, size=200)
+
+    blocked = bootstrap_ci(values, n_boot=400, seed=3)
+    chunked = bootstrap_ci(values, n_boot=400, seed=3, chunk_size=7)
+    scalar = bootstrap_ci(values, stat_func=lambda v: np.median(v), n_boot=400, seed=3)
+
+    assert blocked["ci_lower"] == chunked["ci_lower"]
+    assert blocked["ci_upper"] == chunked["ci_upper"]
+    assert np.isclose(blocked["ci_lower"], scalar["ci_lower"])
+    assert np.isclose(blocked["ci_upper"], scalar["ci_upper"])
+
+
+def test_bootstrap_bca_and_studentized_share_replicates():
+    values = np.random.default_rng(5).lognormal(size=150)
+
+    percentile = bootstrap_ci(values, n_boot=500, seed=1)
+    bca = bootstrap_ci(values, n_boot=500, seed=1, method="bca")
+    # Same statistic without the closed-form jackknife shortcut
+    bca_generic = bootstrap_ci(
+        values, stat_func=lambda v, axis=None: np.median(v, axis=axis),
+        n_boot=500, seed=1, method="bca",
+    )
+    student = bootstrap_ci(values, stat_func=np.mean, n_boot=500, seed=1, method="studentized")
+
+    assert bca["se"] == percentile["se"]
+    assert np.isclose(bca["ci_lower"], bca_generic["ci_lower"])
+    assert np.isclose(bca["ci_upper"], bca_generic["ci_upper"])
+    assert student["ci_lower"] < student["observed"] < student["ci_upper"]
+
+
+def test_permutation_test_block_statistics():
+    rng = np.random.default_rng(21)
+    g1 = rng.normal(0.0, 1.0, size=60)
+    g2 = rng.normal(1.0, 1.0, size=50)
+
+    blocked = permutation_test(g1, g2, stat_func="mean", n_perm=600, seed=2)
+    chunked = permutation_test(g1, g2, stat_func=np.mean, n_perm=600, seed=2, chunk_size=13)
+    ranksum = permutation_test(g1, g2, stat_func="ranksum", n_perm=600, seed=2)
+
+    assert blocked["p_value"] == chunked["p_value"]
+    assert np.isclose(blocked["observed_diff"], g1.mean() - g2.mean())
+    assert ranksum["p_value"] < 0.01
+
+
+def test_permutation_test_sequential_stops_early():
+    rng = np.random.default_rng(4)
+    g1 = rng.normal(size=40)
+    g2 = rng.normal(size=40)
+
+    full = permutation_test(g1, g2, stat_func="mean", n_perm=3000, seed=1)
+    early = permutation_test(
+        g1, g2, stat_func="mean", n_perm=3000, seed=1, sequential=True, alpha=0.05
+    )
+
+    assert full["n_perm_used"] == 3000
+    assert early["n_perm_used"] < 3000
+    assert early["p_value"] > 0.05
+    assert early["mc_se"] > 0
+
+
+def test_permutation_test_exact_ranksum_matches_mann_whitney():
+    rng = np.random.default_rng(8)
+    g1 = rng.normal(0.0, 1.0, size=9)
+    g2 = rng.normal(1.0, 1.0, size=12)
+
+    result = permutation_test(g1, g2, stat_func="ranksum")
+    expected = stats.mannwhitneyu(g1, g2, method="exact").pvalue
+
+    assert result["exact"]
+    assert result["mc_se"] == 0.0
+    assert np.isclose(result["p_value"], expected)
+
+    counts1, counts2 = np.round(g1 * 3), np.round(g2 * 3)
+    monte_carlo = permutation_test(counts1, counts2, stat_func=np.mean, seed=1)
+    exact = permutation_test(counts1, counts2, stat_func=np.mean, exact=True)
+    assert not monte_carlo["exact"]
+    assert exact["exact"]
+
+
+def test_parallel_resampling_is_independent_of_worker_count():
+    rng = np.random.default_rng(13)
+    g1 = rng.normal(size=80)
+    g2 = rng.normal(0.3, 1.0, size=70)
+
+    serial = bootstrap_ci(g1, n_boot=1000, seed=9)
+    parallel = bootstrap_ci(g1, n_boot=1000, seed=9, n_jobs=2)
+    perm_serial = permutation_test(g1, g2, n_perm=1000, seed=9)
+    perm_parallel = permutation_test(g1, g2, n_perm=1000, seed=9, n_jobs=2)
+
+    assert serial["ci_lower"] == parallel["ci_lower"]
+    assert serial["ci_upper"] == parallel["ci_upper"]
+    assert perm_serial["p_value"] == perm_parallel["p_value"]
+
+    class RecordingExecutor(Executor):
+        """Runs tasks inline and has no ``_max_workers`` attribute."""
+
+        def __init__(self):
+            self.calls = 0
+
+        def submit(self, fn, *args, **kwargs):
+            self.calls += 1
+            future = Future()
+            future.set_result(fn(*args, **kwargs))
+            return future
+
+    executor = RecordingExecutor()
+    via_executor = bootstrap_ci(g1, n_boot=1000, seed=9, executor=executor)
+    assert via_executor["ci_lower"] == serial["ci_lower"]
+    assert executor.calls == min(os.cpu_count() or 1, 4)
+
+
+def test_streaming_bootstrap_matches_in_memory_estimates():
+    values = np.random.default_rng(17).lognormal(size=5000)
+    frame = pd.DataFrame({"value": values})
+
+    def chunks():
+        for start in range(0, len(frame), 1200):
+            yield frame.iloc[start : start + 1200]
+
+    mean_ci = bootstrap_ci_streaming(chunks(), "mean", n_boot=300, seed=1, column="value")
+    median_ci = bootstrap_ci_streaming(
+        chunks(), "median", n_boot=300, seed=1, column="value", value_range=(0, 10)
+    )
+
+    assert np.isclose(mean_ci["observed"], values.mean())
+    assert mean_ci["n"] == len(values)
+    assert mean_ci["ci_lower"] < values.mean() < mean_ci["ci_upper"]
+    assert abs(median_ci["observed"] - np.median(values)) < 10 / 2048
+
+
+def test_streaming_quantile_widens_instead_of_clipping():
+    # Time-ordered chunks: every later chunk lies above the first one's range
+    values = np.arange(20000.0)
+    chunks = (values[start : start + 1000] for start in range(0, len(values), 1000))
+
+    result = bootstrap_ci_streaming(chunks, 0.9, n_boot=100, seed=2, bins=512)
+
+    assert abs(result["observed"] - np.quantile(values, 0.9)) < 2 * 20000 / 512
+    assert result["ci_lower"] <= result["observed"] <= result["ci_upper"]
+    with pytest.raises(ValueError):
+        bootstrap_ci_streaming([values], "median", bins=511)
+
+
+def test_bag_of_little_bootstraps_is_reproducible():
+    values = np.random.default_rng(23).normal(loc=3.0, size=20000)
+
+    first = bootstrap_blb(values, "median", n_subsets=6, n_boot=50, seed=4)
+    second = bootstrap_blb(values, "median", n_subsets=6, n_boot=50, seed=4, n_jobs=2)
+
+    assert first["ci_lower"] == second["ci_lower"]
+    assert first["ci_lower"] < np.median(values) < first["ci_upper"]
+    assert first["subset_size"] == round(20000**0.7)
+
+
+def test_spearman_matrix_matches_pairwise_scipy_with_missing_values():
+    rng = np.random.default_rng(31)
+    frame = pd.DataFrame(rng.normal(size=(60, 4)), columns=list("abcd"))
+    frame["b"] = frame["a"].round() + rng.normal(scale=0.5, size=60)
+    frame["c"] = frame["c"].round()
+    frame.loc[rng.choice(60, 8, replace=False), "a"] = np.nan
+    frame.loc[rng.choice(60, 5, replace=False), "d"] = np.nan
+
+    result = correlation_matrix_nonparametric(frame, method="spearman")
+
+    for c1 in frame.columns:
+        for c2 in frame.columns:
+            if c1 == c2:
+                continue
+            valid = frame[[c1, c2]].dropna()
+            rho, p = stats.spearmanr(valid[c1], valid[c2])
+            assert np.isclose(result["correlation"].loc[c1, c2], rho)
+            assert np.isclose(result["p_values"].loc[c1, c2], p)
+
+
+def test_kendall_matrix_matches_pairwise_scipy_with_ties_and_missing_values():
+    rng = np.random.default_rng(37)
+    frame = pd.DataFrame(rng.normal(size=(80, 4)), columns=list("abcd"))
+    frame["b"] = (2 * frame["a"]).round() + rng.normal(scale=0.3, size=80)
+    frame["c"] = frame["c"].round()
+    frame.loc[rng.choice(80, 10, replace=False), "a"] = np.nan
+    frame.loc[rng.choice(80, 6, replace=False), "c"] = np.nan
+
+    result = correlation_matrix_nonparametric(frame, method="kendall")
+
+    for c1 in frame.columns:
+        for c2 in frame.columns:
+            if c1 == c2:
+                continue
+            valid = frame[[c1, c2]].dropna()
+            tau, p = stats.kendalltau(valid[c1], valid[c2])
+            assert np.isclose(result["correlation"].loc[c1, c2], tau)
+            assert np.isclose(result["p_values"].loc[c1, c2], p)
+
+
+def test_kendall_matrix_matches_scipy_on_long_columns():
+    # Long enough for every merge level; short columns stay inside one block
+    rng = np.random.default_rng(43)
+    long = rng.normal(size=(20001, 3))
+    long[:, 1] += long[:, 0]
+    long[:, 2] = np.round(long[:, 2] * 3)
+
+    for values in (long, long[:7]):
+        frame = pd.DataFrame(values, columns=list("abc"))
+        result = correlation_matrix_nonparametric(frame, method="kendall")
+        for c1, c2 in (("a", "b"), ("a", "c"), ("b", "c")):
+            tau, _ = stats.kendalltau(frame[c1], frame[c2])
+            assert np.isclose(result["correlation"].loc[c1, c2], tau)
+
+
+def test_fast_distance_correlation_matches_dense_reference():
+    rng = np.random.default_rng(41)
+    x = rng.normal(size=300)
+    y = x**2 + rng.normal(scale=0.5, size=300)
+    y[::10] = np.round(y[::10])
+
+    fast = distance_correlation(x, y, n_perm=200, seed=3, method="fast")
+    dense = distance_correlation(x, y, n_perm=200, seed=3, method="dense")
+
+    assert np.isclose(fast["dcor"], dense["dcor"])
+    assert fast["p_value"] == dense["p_value"]
+
+
+def test_dense_distance_correlation_permutations_are_chunk_invariant():
+    rng = np.random.default_rng(43)
+    x = rng.normal(size=120)
+    y = np.abs(x) + rng.normal(scale=0.8, size=120)
+
+    default = distance_correlation(x, y, n_perm=300, seed=5, method="dense")
+    sliced = distance_correlation(x, y, n_perm=300, seed=5, method="dense", chunk_size=7)
+    fast = distance_correlation(x, y, n_perm=300, seed=5, method="fast")
+
+    assert default["p_value"] == sliced["p_value"] == fast["p_value"]
+    assert np.isclose(default["dcor"], fast["dcor"])
+
+
+def test_blocked_correlation_matrix_matches_dense_and_resumes(tmp_path):
+    rng = np.random.default_rng(47)
+    frame = pd.DataFrame(rng.normal(size=(50, 7)), columns=list("abcdefg"))
+    frame["b"] = frame["a"] + rng.normal(scale=0.5, size=50)
+    frame.loc[rng.choice(50, 6, replace=False), "e"] = np.nan
+
+    for method in ("spearman", "kendall"):
+        dense = correlation_matrix_nonparametric(frame, method=method)
+        blocked = correlation_matrix_blocked(
+            frame, tmp_path / method, method=method, block_size=3, max_heatmap_cols=5
+        )
+        assert blocked["figure"] is None
+        assert np.allclose(blocked["correlation"], dense["correlation"], equal_nan=True)
+        assert np.allclose(blocked["p_values"], dense["p_values"], equal_nan=True)
+
+    # Drop the last finished tile and damage it; a resumed run recomputes it
+    done = tmp_path / "kendall" / "tiles_done.txt"
+    done.write_text("\n".join(done.read_text().split()[:-1]) + "\n")
+    blocked["correlation"][-1, -1] = 0.0
+    blocked["correlation"].flush()
+    resumed = correlation_matrix_blocked(
+        frame, tmp_path / "kendall", method="kendall", block_size=3, max_heatmap_cols=5
+    )
+    assert np.allclose(resumed["correlation"], dense["correlation"], equal_nan=True)
+
+
+def test_blocked_correlation_ranks_each_column_block_once(tmp_path, monkeypatch):
+    from nonparametric_analysis.core import correlation
+
+    ranked_calls = []
+    original = correlation._ranked_side
+
+    def counting_ranked_side(values_t):
+        ranked_calls.append(len(values_t))
+        return original(values_t)
+
+    monkeypatch.setattr(correlation, "_ranked_side", counting_ranked_side)
+    frame = pd.DataFrame(np.random.default_rng(53).normal(size=(40, 8)))
+
+    correlation_matrix_blocked(frame, tmp_path, block_size=3, max_heatmap_cols=5)
+
+    assert ranked_calls == [3, 3, 2]
+
+
+def test_append_spearman_matches_listwise_full_recompute(tmp_path):
+    rng = np.random.default_rng(53)
+    frame = pd.DataFrame(np.round(rng.normal(size=(120, 4)) * 2), columns=list("abcd"))
+    frame.iloc[7, 2] = np.nan
+
+    first = append_spearman(frame.iloc[:70])
+    save_spearman_state(first["state"], tmp_path / "state.npz")
+    updated = append_spearman(frame.iloc[70:], load_spearman_state(tmp_path / "state.npz"))
+    full = correlation_matrix_nonparametric(frame.dropna(), method="spearman")
+
+    assert updated["n"] == 119
+    assert (first["n_skipped"], updated["n_skipped"]) == (1, 0)
+    assert np.allclose(updated["correlation"], full["correlation"])
+    assert np.allclose(updated["p_values"], full["p_values"])
+
+    save_spearman_state(updated["state"], tmp_path / "state")
+    restored = load_spearman_state(tmp_path / "state")
+    assert (tmp_path / "state.npz").exists()
+    assert restored.keys() == updated["state"].keys()
+    assert all(np.array_equal(restored[k], updated["state"][k]) for k in restored)
+
+
+def test_top_correlated_pairs_match_full_matrix_with_bh():
+    rng = np.random.default_rng(59)
+    frame = pd.DataFrame(rng.normal(size=(100, 12)))
+    frame[1] = frame[0] + rng.normal(scale=0.3, size=100)
+    frame[4] = frame[2] - rng.normal(scale=0.5, size=100)
+    frame[9] = frame[7] + rng.normal(scale=0.8, size=100)
+
+    top = top_correlated_pairs(frame, k_top=3, block_size=5)
+    full = correlation_matrix_nonparametric(frame)
+    tri_i, tri_j = np.triu_indices(12, k=1)
+    rho = full["correlation"].to_numpy()[tri_i, tri_j]
+    adjusted = benjamini_hochberg(full["p_values"].to_numpy()[tri_i, tri_j])
+    strongest = np.argsort(-np.abs(rho))[:3]
+
+    assert top["n_tests"] == len(rho)
+    assert list(zip(top["pairs"]["var1"], top["pairs"]["var2"])) == [
+        (tri_i[s], tri_j[s]) for s in strongest
+    ]
+    assert top["pairs"]["bh_exact"].all()
+    assert np.allclose(top["pairs"]["p_adj"], adjusted[strongest])
+
+
+def test_runs_test_batch_matches_single_series_version():
+    rng = np.random.default_rng(61)
+    block = np.round(rng.normal(size=(50, 4)), 1)
+    block[rng.random(block.shape) < 0.15] = np.nan
+
+    batch = runs_test_batch(pd.DataFrame(block, columns=list("wxyz")))
+
+    assert list(batch["series"]) == list("wxyz")
+    for j in range(4):
+        single = runs_test_analysis(block[:, j])
+        assert batch["runs"][j] == single["runs"]
+        assert np.isclose(batch["expected"][j], single["expected"])
+        assert np.isclose(batch["z"][j], single["z"])
+        assert np.isclose(batch["p_value"][j], single["p_value"])
+
+
+def test_native_mann_kendall_matches_pymannkendall():
+    import pymannkendall as mk
+
+    rng = np.random.default_rng(67)
+    trend = np.linspace(0.0, 1.5, 90)[:, None] * np.array([0.0, 1.0, -1.0, 2.0])
+    block = np.round(rng.normal(size=(90, 4)) + trend, 1)
+    block[rng.random(block.shape) < 0.1] = np.nan
+
+    batch = mann_kendall_batch(block)
+    single = mann_kendall_test(block[:, 1])
+
+    for j in range(4):
+        reference = mk.original_test(block[:, j])
+        assert batch["s"][j] == reference.s
+        assert np.isclose(batch["var_s"][j], reference.var_s)
+        assert np.isclose(batch["tau"][j], reference.Tau)
+        assert np.isclose(batch["p_value"][j], reference.p)
+        assert batch["trend"][j] == reference.trend
+    assert np.isclose(single["p_value"], batch["p_value"][1])
+    assert single["trend"] == batch["trend"][1]
+
+
+def test_sens_slope_selection_matches_all_pairs():
+    import pymannkendall as mk
+    from nonparametric_analysis.core import single_variable
+
+    rng = np.random.default_rng(71)
+    smooth = rng.normal(size=1500) + 0.002 * np.arange(1500)
+    tied = np.round(rng.normal(size=1500) + 0.001 * np.arange(1500))
+
+    for x in (smooth, tied):
+        n_pairs = len(x) * (len(x) - 1) // 2
+        for rank in ((n_pairs - 1) // 2, n_pairs // 2, 17):
+            i, j = np.triu_indices(len(x), 1)
+            expected = np.sort((x[j] - x[i]) / (j - i))[rank]
+            found = single_variable._slope_at_rank(
+                x, rank, None, np.random.default_rng(0)
+            )
+            assert found == expected
+
+    slope, intercept = mk.sens_slope(tied)
+    result = sens_slope(tied, alpha=0.05)
+    assert np.isclose(result["slope"], slope)
+    assert np.isclose(result["intercept"], intercept)
+    assert result["ci_lower"] <= result["slope"] <= result["ci_upper"]
+
+    approx = sens_slope(smooth, approx_tol=1e-4)
+    assert abs(approx["slope"] - mk.sens_slope(smooth)[0]) <= 0.5e-4
+
+
+def test_pettitt_batch_matches_single_series_by_entity():
+    rng = np.random.default_rng(73)
+    n_rows = 150
+    entity = rng.choice(["north", "south", "east"], size=n_rows)
+    shift = (np.arange(n_rows) > 80).astype(float)
+    df = pd.DataFrame(
+        {
+            "site": entity,
+            "flow": np.round(rng.normal(size=n_rows) + shift, 1),
+            "level": np.round(rng.normal(size=n_rows) - 2 * shift, 1),
+        }
+    )
+    df.loc[rng.random(n_rows) < 0.1, "flow"] = np.nan
+    df["date"] = pd.date_range("2024-01-01", periods=n_rows, freq="D").astype(str)
+    df["station_code"] = "S-" + df["site"]
+    shuffled = df.sample(frac=1.0, random_state=3)
+
+    batch = pettitt_batch(shuffled, by="site", time="date")
+
+    assert {column for column, _ in batch["series"]} == {"flow", "level"}
+    for k, (column, site) in enumerate(batch["series"]):
+        single = pettitt_test(df.loc[df["site"] == site, column])
+        assert batch["change_point"][k] == single["change_point"]
+        assert batch["statistic"][k] == single["statistic"]
+        assert np.isclose(batch["p_value"][k], single["p_value"])
+        assert np.isclose(batch["median_before"][k], single["median_before"])
+        assert np.isclose(batch["median_after"][k], single["median_after"])
+
+    flow_only = pettitt_batch(shuffled, by="site", time="date", value_columns=["flow"])
+    assert [column for column, _ in flow_only["series"]] == ["flow"] * 3
+
+
+def test_pettitt_permutation_pvalue_matches_exact_null():
+    from itertools import permutations
+
+    data = np.array([0.3, -0.1, 0.4, 0.2, 1.4, 1.1, 0.9, 1.6])
+    ranks = stats.rankdata(data)
+    t = np.arange(1, len(data))
+    observed = np.abs(2 * np.cumsum(ranks)[:-1] - t * (len(data) + 1)).max()
+    null = np.array(
+        [
+            np.abs(2 * np.cumsum(perm)[:-1] - t * (len(data) + 1)).max()
+            for perm in permutations(ranks)
+        ]
+    )
+    exact_p = np.mean(null >= observed)
+
+    asymptotic = pettitt_test(data)
+    result = pettitt_test(data, method="permutation", n_perm=20000, seed=5)
+    chunked = pettitt_test(
+        data, method="permutation", n_perm=20000, seed=5, chunk_size=333
+    )
+
+    assert result["statistic"] == observed
+    assert result["n_perm_used"] == 20000
+    assert abs(result["p_value"] - exact_p) < 4 * result["mc_se"] + 1e-3
+    assert chunked["p_value"] == result["p_value"]
+    assert asymptotic["p_value"] > exact_p
+
+
+def test_native_pelt_matches_ruptures_and_penalty_path():
+    import ruptures as rpt
+
+    rng = np.random.default_rng(79)
+    regimes = [(0, 1), (3, 1), (3, 3), (-1, 1)]
+    data = np.concatenate([rng.normal(mean, scale, 60) for mean, scale in regimes])
+
+    for model in ("l2", "normal", "rank"):
+        native = detect_changepoints_pelt(data, model=model, penalty=15.0, jump=1)
+        reference = (
+            rpt.Pelt(model=model, min_size=2, jump=1)
+            .fit(data.reshape(-1, 1))
+            .predict(pen=15.0)
+        )
+        assert native["changepoints"] == reference[:-1]
+        # Defaults (penalty log(n) * var(x), jump 5) agree across engines
+        default = detect_changepoints_pelt(data, model=model)
+        legacy = detect_changepoints_pelt(data, model=model, engine="ruptures")
+        assert default["changepoints"] == legacy["changepoints"]
+
+    for penalty in (5.0, 40.0, 300.0):
+        tuned = detect_changepoints_pelt(
+            data, model="l2", penalty=penalty, penalty_range=(1.0, 500.0), jump=1
+        )
+        direct = detect_changepoints_pelt(data, model="l2", penalty=penalty, jump=1)
+        assert tuned["changepoints"] == direct["changepoints"]
+    path = tuned["penalty_path"]
+    assert path["n_changepoints"].is_monotonic_decreasing
+    # One cached path for the three penalties, keyed by digest, not by the data
+    from nonparametric_analysis.core import single_variable
+
+    cached = [key for key in single_variable._PELT_PATHS if key[1] == len(data)]
+    assert len(cached) == 1 and len(cached[0][0]) == 16
+    assert path["cost"].is_monotonic_increasing
+
+
+def test_pettitt_segmentation_finds_each_shift():
+    rng = np.random.default_rng(83)
+    data = np.round(
+        np.concatenate(
+            [rng.normal(size=400), rng.normal(size=300) + 1.5, rng.normal(size=400)]
+        ),
+        1,
+    )
+
+    first = pettitt_segmentation(data, max_changepoints=1)
+    single = pettitt_test(data)
+    assert first["changepoints"] == [single["change_point"]]
+    assert first["details"]["statistic"][0] == single["statistic"]
+
+    binary = pettitt_segmentation(data, alpha=1e-6, min_size=20)
+    wild = pettitt_segmentation(data, alpha=1e-6, min_size=20, n_intervals=40, seed=3)
+    for result in (binary, wild):
+        assert result["n_segments"] == 3
+        assert abs(result["changepoints"][0] - 400) <= 10
+        assert abs(result["changepoints"][1] - 700) <= 10
+
+
+def test_pettitt_segmentation_ranks_underflowing_p_values_by_strength():
+    # Both child splits have p-values that underflow to 0.0; the stronger
+    # shift at 30000 must still be taken before the weaker one at 10000
+    rng = np.random.default_rng(5)
+    data = rng.normal(size=40000)
+    data[10000:] += 1.0
+    data[20000:] += 20.0
+    data[30000:] += 4.0
+
+    full = pettitt_segmentation(data)
+    assert (full["details"]["p_value"] == 0.0).all()
+
+    top = pettitt_segmentation(data, max_changepoints=2)
+    assert top["changepoints"] == [20000, 30000]
+
+
+def test_mann_kendall_panel_matches_per_entity_tests():
+    import pymannkendall as mk
+
+    rng = np.random.default_rng(89)
+    frames = []
+    for k, length in enumerate([30, 45, 24]):
+        t = np.arange(1, length + 1)
+        trend = 0.1 * k * t + np.sin(t)
+        frames.append(
+            pd.DataFrame(
+                {
+                    "entity_id": f"E{k}",
+                    "time_index": t,
+                    "feature_1": np.round(trend + rng.normal(size=length), 1),
+                    "feature_2": np.round(rng.normal(size=length), 1),
+                }
+            )
+        )
+    panel = pd.concat(frames, ignore_index=True)
+    # E2 skips one period: later seasons must not shift
+    gap = (panel["entity_id"] == "E2") & (panel["time_index"] == 10)
+    panel = panel[~gap]
+    panel = panel.sample(frac=1.0, random_state=3)
+    panel.loc[panel.index[:6], "feature_1"] = np.nan
+
+    table = mann_kendall_panel(panel, period=4)
+
+    assert len(table) == 3 * 2 * 2
+    for row in table.itertuples():
+        series = panel[panel["entity_id"] == row.entity_id].set_index("time_index")
+        values = series[row.feature].sort_index()
+        if row.test == "original":
+            reference = mk.original_test(values.to_numpy())
+        else:
+            regular = values.reindex(range(1, values.index.max() + 1)).to_numpy()
+            reference = mk.seasonal_test(regular, period=4)
+        assert row.s == reference.s
+        assert np.isclose(row.var_s, reference.var_s)
+        assert np.isclose(row.tau, reference.Tau)
+        assert np.isclose(row.p_value, reference.p)
+        assert row.trend == reference.trend
+
+    with pytest.raises(ValueError):
+        mann_kendall_panel(panel.assign(time_index=panel["time_index"] + 0.5), period=4)
+
+
+def test_autocorrelation_corrected_mann_kendall_matches_pymannkendall():
+    import pymannkendall as mk
+
+    rng = np.random.default_rng(97)
+    noise = rng.normal(size=(150, 3))
+    block = np.zeros_like(noise)
+    for t in range(1, len(block)):
+        block[t] = 0.7 * block[t - 1] + noise[t]
+    block = np.round(block + np.linspace(0, 2, 150)[:, None] * [0.0, 1.0, -0.5], 1)
+    block[rng.random(block.shape) < 0.05] = np.nan
+
+    for correction, test in [
+        ("hamed_rao", mk.hamed_rao_modification_test),
+        ("yue_wang", mk.yue_wang_modification_test),
+    ]:
+        for lag in (None, 4):
+            batch = mann_kendall_batch(block, correction=correction, lag=lag)
+            for j in range(3):
+                series = block[:, j][~np.isnan(block[:, j])]
+                reference = test(series, lag=lag)
+                assert np.isclose(batch["var_s"][j], reference.var_s)
+                assert np.isclose(batch["p_value"][j], reference.p)
+                assert batch["trend"][j] == reference.trend
+
+    single = mann_kendall_test(block[:, 1], correction="yue_wang")
+    batch = mann_kendall_batch(block, correction="yue_wang")
+    assert np.isclose(single["p_value"], batch["p_value"][1])
+
+
+def test_normality_batch_matches_scipy_tests():
+    rng = np.random.default_rng(101)
+    frame = pd.DataFrame(
+        {
+            "normal": rng.normal(size=400),
+            "skewed": rng.exponential(size=400),
+            "flat": rng.uniform(size=400),
+        }
+    )
+    frame.iloc[rng.random(frame.shape) < 0.1] = np.nan
+
+    batch = normality_batch(frame, shapiro_max_n=300, seed=4)
+    again = normality_batch(frame, shapiro_max_n=300, seed=4)
+
+    for k, column in enumerate(frame.columns):
+        values = frame[column].dropna().to_numpy()
+        jb = stats.jarque_bera(values)
+        k2 = stats.normaltest(values)
+        ad = stats.anderson(values, method="interpolate")
+        assert np.isclose(batch["jb_statistic"][k], jb.statistic)
+        assert np.isclose(batch["jb_p_value"][k], jb.pvalue)
+        assert np.isclose(batch["dagostino_statistic"][k], k2.statistic)
+        assert np.isclose(batch["dagostino_p_value"][k], k2.pvalue)
+        assert np.isclose(batch["ad_statistic"][k], ad.statistic)
+        assert 0 <= batch["shapiro_p_value"][k] <= 1
+    assert np.array_equal(batch["shapiro_statistic"], again["shapiro_statistic"])
+    assert batch["ad_p_value"][0] > 0.05 > batch["ad_p_value"][1]
+
+    # Same subsample as the figure-free single-series test
+    from nonparametric_analysis.core import test_normality as normality_test
+
+    for k, column in enumerate(frame.columns):
+        single = normality_test(frame[column], plot=False, shapiro_max_n=300, seed=4)
+        alone = normality_batch(frame[[column]], shapiro_max_n=300, seed=4)
+        assert single["statistic"] == batch["shapiro_statistic"][k]
+        assert single["p_value"] == batch["shapiro_p_value"][k]
+        assert alone["shapiro_p_value"][0] == batch["shapiro_p_value"][k]
+
+    # The default seed is fixed, so repeated calls agree
+    first = normality_test(frame["skewed"], plot=False, shapiro_max_n=300)
+    second = normality_test(frame["skewed"], plot=False, shapiro_max_n=300)
+    assert first["p_value"] == second["p_value"]